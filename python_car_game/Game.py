@@ -1,4 +1,8 @@
-import pygame, sys, time, random, datetime
+import time
+_import_start = time.perf_counter()
+
+import pygame, sys, os, random, datetime
+from functools import lru_cache, partial
 from pygame.locals import *
 from database import (
     get_or_create_player,
@@ -6,15 +10,32 @@ from database import (
     get_player_stats,
     player_owns_skin,
     unlock_skin,
+    save_replay,
+    warm_up as warm_up_db,
 )
-
-pygame.init()
+from renderer import create_renderer, load_image, adopt_image, cut_frame, to_canvas, flash_image, DrawList
+from collision import frame_mask, frame_masks, collide_pixels, collide_hitboxes, LaneGroup
+from governor import QualityGovernor, LEVELS
+from startup import Preloader, StartupTimer
+from telemetry import EventLog
+from bullets import BulletPool, ring, spiral, aimed
+from particles import ParticleSystem
+from scheduler import Scheduler
+from diagnostics import FrameProfiler, GCPolicy
+from replay import Recording
+from latency import LatencyTracer, FramePacer
+from snapshot import Snapshot, RewindBuffer, WORLD_FIELDS, BOSS_FIELDS
+
+# Importing this module only defines things; init() starts pygame, opens the
+# window and loads shared resources.
+STARTUP = StartupTimer(start=_import_start)
+STARTUP.add("imports", (time.perf_counter() - _import_start) * 1000)
 
 # ---------------- SETTINGS ----------------
 FPS = 60
 FramePerSec = pygame.time.Clock()
+GOVERNOR    = QualityGovernor(1000 / FPS)
 sprite_sheet_path = "Porcupine - sprite sheet.png"  # default skin
-boss_mode = False  
 
 # Colors
 WHITE  = (255, 255, 255)
@@ -28,19 +49,46 @@ YELLOW = (255, 255,   0)
 SCREEN_WIDTH  = 600
 SCREEN_HEIGHT = 400
 DEBUG_HITBOX  = False
-
-font_large = pygame.font.SysFont("Verdana", 60)
-font_med   = pygame.font.SysFont("Verdana", 30)
-font_small = pygame.font.SysFont("Verdana", 20)
-
-DISPLAYSURF = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Porcupine Infinite Road")
-
-# Load background
-background = pygame.image.load("scrol road.png").convert()
-BG_HEIGHT   = background.get_height()
-camera_y    = BG_HEIGHT - SCREEN_HEIGHT
-last_camera_y = camera_y
+ADAPTIVE_QUALITY = True       # shed optional work (see governor.LEVELS) when frames run long
+SHOW_PERF     = False         # HUD line with the quality level and frame times
+TELEMETRY_ENABLED = True      # log gameplay events to the `events` table
+TELEMETRY     = None          # EventLog, started by init()
+RECORD_REPLAYS = True         # keep seed + inputs of the best runs (export.py renders them)
+DIAGNOSTICS   = False         # per-frame allocation + GC pause tracking, report printed after each run
+GC_TUNING     = True          # freeze startup objects, hold GC off during runs, collect between screens
+PROFILER      = FrameProfiler() if DIAGNOSTICS else None
+GC_POLICY     = GCPolicy() if GC_TUNING else None
+LATENCY_TRACE = False         # time key events from arrival to flip, report printed after each run
+LOW_LATENCY   = False         # sample input just before the deadline, precise sleep+spin pacing
+LATENCY       = LatencyTracer() if LATENCY_TRACE else None
+PACER         = FramePacer(FPS) if LOW_LATENCY else None
+PIXEL_COLLISION = False       # True = mask tests (after a rect check) instead of tuned hitboxes
+RENDER_BACKEND = "software"   # "software" or "texture" (SDL2 Renderer, falls back to software)
+CRASH_FRAMES  = 30            # frames the crash effect plays before the game-over screen
+BOSS_PATTERN  = "cross"       # boss bullets: "cross" (4-way), "ring", "spiral" or "aimed"
+REWIND_ENABLED = False        # BACKSPACE rewinds REWIND_SECONDS (up to 10 s back); runs that rewind aren't scored
+REWIND_SECONDS = 2
+PRACTICE_BOSS = False         # dying in the boss fight restarts the fight (unscored) instead of ending the run
+CHECKPOINT_FILE = "checkpoint.npz"   # run state saved every CHECKPOINT_EVERY s for resuming after a crash (not a quit); None = off
+CHECKPOINT_EVERY = 5
+
+# Gameplay is drawn on a canvas of SCREEN size / RENDER_SCALE and scaled to the
+# window once per frame. 2 = the art's native resolution (sprites are 2x art).
+RENDER_SCALE  = 1
+SCALE_FILTER  = "nearest"    # "nearest" or "smooth"
+WINDOW_SIZE   = None         # None = SCREEN_WIDTH x SCREEN_HEIGHT
+FULLSCREEN    = False
+
+# Font file loaded directly (no system font lookup); None = pygame's bundled default font
+FONT_FILE     = None
+STARTUP_REPORT = False        # print the startup phase timings once the first frame is up
+
+# Set by init()
+font_large = font_med = font_small = None
+RENDERER    = None
+DISPLAYSURF = None
+background  = None
+BG_HEIGHT   = None
 
 # ---------------- ENEMY TYPES ----------------
 ENEMY_TYPES = [
@@ -51,19 +99,43 @@ ENEMY_TYPES = [
     {"name": "Taxi",       "image": "Enemy.png",       "speed_range": (4, 6)},
 ]
 
-# Global projectile group
-projectiles = pygame.sprite.Group()
+# Collision broadphase buckets world space into bands one car lane tall
+LANE_HEIGHT = 120
+
+# Draw-list layers, back to front
+LAYER_ROAD, LAYER_CARS, LAYER_COINS, LAYER_BOSS, LAYER_BULLETS, LAYER_PLAYER, LAYER_EFFECTS = range(7)
+LAYERS = 7
+
+# Average extra coins spawned per second (while fewer than 10 are on the road)
+COIN_RATE = 1.2
+
+# Timer callbacks a snapshot can hold, as (owner, method); the index is what gets saved
+TIMER_CALLBACKS = [
+    ("world",  "spawn_coin"),
+    ("player", "next_frame"),
+    ("coin",   "next_frame"),
+    ("boss",   "next_frame"),
+    ("boss",   "shoot"),
+    ("boss",   "become_vulnerable"),
+    ("boss",   "become_armoured"),
+    ("boss",   "toggle_flash"),
+    ("boss",   "end_flash"),
+]
+TIMER_CODES = {callback: code for code, callback in enumerate(TIMER_CALLBACKS)}
+# Boss.timers key for each boss callback
+BOSS_TIMER_NAMES = {"next_frame": "anim", "shoot": "shoot", "become_vulnerable": "phase",
+                    "become_armoured": "phase", "toggle_flash": "flash", "end_flash": "flash"}
+DIRECTIONS = ("up", "down", "left", "right")
+ENEMY_TYPE_INDEX = {t["name"]: i for i, t in enumerate(ENEMY_TYPES)}
 
 # ---------------- ENEMY ----------------
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, lane_y, direction, enemy_type):
+    def __init__(self, world, lane_y, direction, enemy_type):
         super().__init__()
-        self.image = pygame.image.load(enemy_type["image"]).convert_alpha()
-        if direction == "left":
-            self.image = pygame.transform.flip(self.image, True, False)
-
-        self.rect = self.image.get_rect()
-        global boss_mode
+        self.world = world
+        self.image, size = load_car_image(enemy_type["image"], direction == "left")
+        self.rect = pygame.Rect((0, 0), size)
+        self.mask = frame_mask(self.image, size)
 
         # Hitbox
         self.hitbox = self.rect.copy()
@@ -73,73 +145,61 @@ class Enemy(pygame.sprite.Sprite):
         self.hitbox.center = self.rect.center
 
         self.lane_y    = lane_y
+        self.type_name = enemy_type["name"]
         self.direction = direction
-        self.speed     = random.randint(*enemy_type["speed_range"])
+        self.speed     = world.rng.randint(*enemy_type["speed_range"])
         self.world_y   = lane_y
 
         if direction == "right":
-            self.world_x = random.randint(-SCREEN_WIDTH, SCREEN_WIDTH)
+            self.world_x = world.rng.randint(-SCREEN_WIDTH, SCREEN_WIDTH)
         else:
-            self.world_x = random.randint(0, SCREEN_WIDTH * 2)
+            self.world_x = world.rng.randint(0, SCREEN_WIDTH * 2)
+        self.place()
+
+    def lane_span(self):
+        return self.world_y, self.rect.height
+
+    def place(self):
+        # screen-space rect/hitbox for this frame's camera
+        self.rect.topleft  = (self.world_x, (self.world_y - self.world.camera_y) % BG_HEIGHT)
+        self.hitbox.center = self.rect.center
 
     def update(self):
         if self.direction == "right":
             self.world_x += self.speed
             if self.world_x > SCREEN_WIDTH + self.rect.width:
-                if boss_mode:
+                if self.world.boss_mode:
                     self.kill()
                 else: 
                     self.world_x = -self.rect.width
         else:
             self.world_x -= self.speed
             if self.world_x < -self.rect.width:
-                if boss_mode:
+                if self.world.boss_mode:
                     self.kill()
                 else:
                     self.world_x = SCREEN_WIDTH + self.rect.width
+        self.place()
 
-    def draw(self, surface, camera_y):
-        screen_y = (self.world_y - camera_y) % BG_HEIGHT
-        if -self.rect.height < screen_y < SCREEN_HEIGHT:
-            surface.blit(self.image, (self.world_x, screen_y))
-            self.hitbox.center = (
-                self.world_x + self.rect.width // 2,
-                screen_y + self.rect.height // 2,
-            )
-            if DEBUG_HITBOX:
-                pygame.draw.rect(surface, RED, self.hitbox, 1)
 
 
 # ---------------- Boss ----------------
 class Boss(pygame.sprite.Sprite):
-    def __init__(self, lane_y):
+    def __init__(self, world, lane_y):
         super().__init__()
+        self.world = world
 
-        self.sheet = pygame.image.load("idle_32x32_4rows.png").convert_alpha()
-
-        self.frame_width  = 32
-        self.frame_height = 32
-
-        sheet_w, sheet_h = self.sheet.get_size()
-        self.num_frames = sheet_h // self.frame_height
-
-        self.frames = []
-        for i in range(self.num_frames):
-            frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-            frame.blit(
-                self.sheet,
-                (0, 0),
-                (0, i * self.frame_height, self.frame_width, self.frame_height),
-            )
-            frame = pygame.transform.scale(frame, (96, 96))
-            self.frames.append(frame)
+        # one column of 32x32 frames, drawn at 96x96
+        self.frames = load_sheet_frames("idle_32x32_4rows.png", 32, 32, (96, 96))[0]
+        self.masks  = frame_masks(self.frames, (96, 96))
+        self.num_frames = len(self.frames)
 
         self.current_frame   = 0
-        self.animation_speed = FPS / self.num_frames
-        self.frame_counter   = 0
+        self.frame_time      = 1 / self.num_frames   # seconds per frame: one cycle a second
 
         self.image = self.frames[0]
-        self.rect  = self.image.get_rect()
+        self.mask  = self.masks[0]
+        self.rect  = pygame.Rect(0, 0, 96, 96)
 
         # World position
         self.world_x = SCREEN_WIDTH // 2 - self.rect.width // 2
@@ -149,23 +209,20 @@ class Boss(pygame.sprite.Sprite):
         self.speed_x = 3
         self.speed_y = 2
 
-        # Shooting (effectively disabled)
-        self.shoot_cooldown = 60
-        self.shoot_timer = 0
+        # Shooting (see BOSS_PATTERN); the spiral fires small volleys often
+        self.shoot_interval = (4 if BOSS_PATTERN == "spiral" else 60) / FPS
+        self.spiral_angle = 0.0
 
         # HP / damage phase
         self.max_hp = 5
         self.hp = self.max_hp
 
         self.is_vulnerable = False
-        self.phase_timer   = 0
-        self.vuln_timer    = 0
         self.took_hit_this_phase = False
+        self.flash_on = False
 
-        # flashing
-        self.flash_timer      = 0
-        self.flash_on         = False
-        self.after_hit_timer  = 0
+        # name -> Timer on world.timers, started by activate()
+        self.timers = {}
 
         # Hitbox
         self.hitbox = self.rect.copy()
@@ -174,16 +231,58 @@ class Boss(pygame.sprite.Sprite):
         self.hitbox.height = int(h * 0.6)
         self.hitbox.center = self.rect.center
 
-    def update(self):
-        global camera_y
+    def place(self):
+        self.rect.topleft  = (self.world_x, (self.world_y - self.world.camera_y) % BG_HEIGHT)
+        self.hitbox.center = self.rect.center
 
-        # Animation
-        self.frame_counter += 1
-        if self.frame_counter >= self.animation_speed:
-            self.frame_counter = 0
-            self.current_frame = (self.current_frame + 1) % self.num_frames
-            self.image = self.frames[self.current_frame]
+    def activate(self):
+        """Boss fight starts: animate, shoot and begin the armoured/vulnerable cycle."""
+        clock = self.world.timers
+        self.timers["anim"]  = clock.call_later(self.frame_time, self.next_frame)
+        self.timers["shoot"] = clock.call_every(self.shoot_interval, self.shoot)
+        # wait 10 seconds between damage phases
+        self.timers["phase"] = clock.call_later(10, self.become_vulnerable)
+
+    def stop(self):
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers.clear()
+
+    def next_frame(self):
+        self.current_frame = (self.current_frame + 1) % self.num_frames
+        self.image = self.frames[self.current_frame]
+        self.mask  = self.masks[self.current_frame]
+        self.timers["anim"] = self.world.timers.call_later(
+            self.frame_time * self.world.quality["anim_div"], self.next_frame)
+
+    def become_vulnerable(self):
+        self.world.log("boss_phase", detail="vulnerable")
+        self.is_vulnerable = True
+        self.took_hit_this_phase = False
+        self.flash_on = True
+        clock = self.world.timers
+        # flashing while vulnerable & not yet hit
+        self.timers["flash"] = clock.call_every(5 / FPS, self.toggle_flash)
+        # 5-second vulnerable window
+        self.timers["phase"] = clock.call_later(5, self.become_armoured)
+
+    def become_armoured(self):
+        self.world.log("boss_phase", detail="armoured")
+        self.is_vulnerable = False
+        self.took_hit_this_phase = False
+        self.flash_on = False
+        flash = self.timers.pop("flash", None)     # None if restored after the hit flash ended
+        if flash is not None:
+            flash.cancel()
+        self.timers["phase"] = self.world.timers.call_later(10, self.become_vulnerable)
 
+    def toggle_flash(self):
+        self.flash_on = not self.flash_on
+
+    def end_flash(self):
+        self.flash_on = False
+
+    def update(self):
         # Movement in world space
         self.world_x += self.speed_x
         self.world_y += self.speed_y
@@ -193,54 +292,13 @@ class Boss(pygame.sprite.Sprite):
             self.speed_x *= -1
 
         # Vertical bounce
-        screen_y = (self.world_y - camera_y) % BG_HEIGHT
+        screen_y = (self.world_y - self.world.camera_y) % BG_HEIGHT
         TOP_LIMIT    = 40
         BOTTOM_LIMIT = SCREEN_HEIGHT - self.rect.height - 40
         if screen_y < TOP_LIMIT or screen_y > BOTTOM_LIMIT:
             self.speed_y *= -1
 
-        # Shooting (disabled by huge cooldown, but we'll keep logic)
-        self.shoot_timer += 1
-        if self.shoot_timer >= self.shoot_cooldown:
-            self.shoot_timer = 0
-            self.shoot()
-
-        # Damage-phase timers
-        if self.is_vulnerable:
-            self.vuln_timer += 1
-
-            if not self.took_hit_this_phase:
-                # flashing while vulnerable & not yet hit
-                self.flash_timer += 1
-                if self.flash_timer >= 5:
-                    self.flash_timer = 0
-                    self.flash_on = not self.flash_on
-            else:
-                # after we've been hit this phase, keep flashing for 1 second
-                self.after_hit_timer += 1
-                if self.after_hit_timer >= FPS:
-                    self.flash_on = False
-
-            # End of 5-second vulnerable window
-            if self.vuln_timer >= 5 * FPS:
-                self.is_vulnerable = False
-                self.vuln_timer = 0
-                self.phase_timer = 0
-                self.took_hit_this_phase = False
-                self.flash_on = False
-                self.flash_timer = 0
-                self.after_hit_timer = 0
-        else:
-            # wait 10 seconds between damage phases
-            self.phase_timer += 1
-            if self.phase_timer >= 10 * FPS:
-                self.is_vulnerable = True
-                self.vuln_timer = 0
-                self.phase_timer = 0
-                self.took_hit_this_phase = False
-                self.flash_timer = 0
-                self.flash_on = True
-                self.after_hit_timer = 0
+        self.place()
 
     def take_hit(self):
         # returns True if boss dies
@@ -248,118 +306,52 @@ class Boss(pygame.sprite.Sprite):
             return False
         self.hp -= 1
         self.took_hit_this_phase = True
-        self.after_hit_timer = 0
+        # after we've been hit this phase, keep the flash for 1 second
+        self.timers.pop("flash").cancel()
+        self.timers["flash"] = self.world.timers.call_later(1, self.end_flash)
         return self.hp <= 0
 
     def shoot(self):
-        global projectiles
         cx = self.world_x + self.rect.width  // 2
         cy = self.world_y + self.rect.height // 2
-        speed = 6
-
-        directions = [
-            (0, -speed),
-            (0,  speed),
-            (-speed, 0),
-            ( speed, 0),
-        ]
-
-        for vx, vy in directions:
-            projectiles.add(Projectile(cx, cy, vx, vy))
-
-    def draw(self, surface, camera_y):
-        screen_y = (self.world_y - camera_y) % BG_HEIGHT
-        if -self.rect.height < screen_y < SCREEN_HEIGHT:
-            img = self.frames[self.current_frame]
-            if self.is_vulnerable and self.flash_on:
-                img = img.copy()
-                img.fill((255, 255, 255, 0), special_flags=pygame.BLEND_RGBA_ADD)
-
-            surface.blit(img, (self.world_x, screen_y))
-
-            self.hitbox.center = (
-                self.world_x + self.rect.width // 2,
-                screen_y + self.rect.height // 2,
-            )
-            if DEBUG_HITBOX:
-                pygame.draw.rect(surface, RED, self.hitbox, 1)
-
-
-# ---------------- PROJECTILE ----------------
-class Projectile(pygame.sprite.Sprite):
-    def __init__(self, world_x, world_y, vx, vy):
-        super().__init__()
-        self.image = pygame.Surface((16, 16), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, RED, (8, 8), 8)
-
-        self.rect = self.image.get_rect()
-        self.world_x = world_x
-        self.world_y = world_y
-        self.vx = vx
-        self.vy = vy
-
-        self.hitbox = self.rect.copy()
-        self.hitbox.width  = int(self.rect.width * 0.8)
-        self.hitbox.height = int(self.rect.height * 0.8)
-        self.hitbox.center = self.rect.center
-
-    def update(self):
-        global camera_y
-
-        # move in world space
-        self.world_x += self.vx
-        self.world_y += self.vy
-
-        # compute screen position
-        screen_y = (self.world_y - camera_y) % BG_HEIGHT
-        self.rect.center = (int(self.world_x), int(screen_y))
-        self.hitbox.center = self.rect.center
-
-        # kill if off-screen
-        if (self.rect.right < 0 or self.rect.left > SCREEN_WIDTH or
-            self.rect.bottom < 0 or self.rect.top > SCREEN_HEIGHT):
-            self.kill()
+        bullets = self.world.bullets
+
+        if BOSS_PATTERN == "ring":
+            # a ring that turns a little each volley so the gaps move
+            self.spiral_angle = spiral(bullets, cx, cy, 24, 4, self.spiral_angle, turn=0.13)
+        elif BOSS_PATTERN == "spiral":
+            self.spiral_angle = spiral(bullets, cx, cy, 3, 4, self.spiral_angle)
+        elif BOSS_PATTERN == "aimed":
+            P1 = self.world.player
+            aimed(bullets, cx, cy, (P1.rect.centerx, self.world.camera_y + P1.rect.centery), 5, 5)
+        else:
+            ring(bullets, cx, cy, 4, 6)   # up / right / down / left
 
-    def draw(self, surface, camera_y):
-        screen_y = (self.world_y - camera_y) % BG_HEIGHT
-        surface.blit(self.image, (self.world_x - self.rect.width // 2,
-                                  screen_y   - self.rect.height // 2))
-        self.rect.center = (int(self.world_x), int(screen_y))
-        self.hitbox.center = self.rect.center
-        if DEBUG_HITBOX:
-            pygame.draw.rect(surface, YELLOW, self.hitbox, 1)
+    def frame_image(self):
+        # flash frames are cached white silhouettes, not a copy per frame
+        if self.is_vulnerable and self.flash_on and self.world.quality["flash"]:
+            return flash_image(self.image)
+        return self.image
 
 
 # ---------------- COIN OBJECT ----------------
 class Object(pygame.sprite.Sprite):
-    def __init__(self, lane_y):
+    def __init__(self, world, lane_y):
         super().__init__()
+        self.world = world
 
-        # Horizontal coin sprite sheet
-        self.sheet = pygame.image.load("coin1_16x16.png").convert_alpha()
-        self.frame_width  = 16
-        self.frame_height = 16
-        sheet_width, sheet_height = self.sheet.get_size()
-
-        self.num_frames = sheet_width // self.frame_width
-
-        self.frames = []
-        for i in range(self.num_frames):
-            frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-            frame.blit(
-                self.sheet,
-                (0, 0),
-                (i * self.frame_width, 0, self.frame_width, self.frame_height),
-            )
-            frame = pygame.transform.scale(frame, (32, 32))
-            self.frames.append(frame)
+        # Horizontal coin sprite sheet, 16x16 frames drawn at 32x32
+        columns = load_sheet_frames("coin1_16x16.png", 16, 16, (32, 32))
+        self.frames = [column[0] for column in columns]
+        self.masks  = frame_masks(self.frames, (32, 32))
+        self.num_frames = len(self.frames)
 
-        self.current_frame   = 0
-        self.animation_speed = FPS / self.num_frames
-        self.frame_counter   = 0
+        self.current_frame = 0
+        self.frame_time    = 1 / self.num_frames   # one spin a second
 
         self.image  = self.frames[0]
-        self.rect   = self.image.get_rect()
+        self.mask   = self.masks[0]
+        self.rect   = pygame.Rect(0, 0, 32, 32)
         self.hitbox = self.rect.copy()
         w, h = self.rect.size
         self.hitbox.width  = int(w * 0.7)
@@ -368,61 +360,50 @@ class Object(pygame.sprite.Sprite):
 
         self.lane_y  = lane_y
         self.world_y = lane_y
-        self.world_x = random.randint(50, SCREEN_WIDTH - 50)
+        self.world_x = world.rng.randint(50, SCREEN_WIDTH - 50)
+        self.place()
+        world.timers.call_later(self.frame_time, self.next_frame)
+
+    def lane_span(self):
+        return self.world_y, self.rect.height
+
+    def next_frame(self):
+        if not self.alive():
+            return      # collected or cleared: let the animation lapse
+        self.current_frame = (self.current_frame + 1) % self.num_frames
+        self.image = self.frames[self.current_frame]
+        self.mask  = self.masks[self.current_frame]
+        self.world.timers.call_later(self.frame_time * self.world.quality["anim_div"], self.next_frame)
+
+    def place(self):
+        self.rect.topleft  = (self.world_x, (self.world_y - self.world.camera_y) % BG_HEIGHT)
+        self.hitbox.center = self.rect.center
 
     def update(self):
-        self.frame_counter += 1
-        if self.frame_counter >= self.animation_speed:
-            self.frame_counter = 0
-            self.current_frame = (self.current_frame + 1) % self.num_frames
-            self.image = self.frames[self.current_frame]
-
-    def draw(self, surface, camera_y):
-        screen_y = (self.world_y - camera_y) % BG_HEIGHT
-        if -self.rect.height < screen_y < SCREEN_HEIGHT:
-            surface.blit(self.image, (self.world_x, screen_y))
-            self.hitbox.center = (
-                self.world_x + self.rect.width // 2,
-                screen_y + self.rect.height // 2,
-            )
-            if DEBUG_HITBOX:
-                pygame.draw.rect(surface, RED, self.hitbox, 1)
+        self.place()
+
 
 
 # ---------------- PLAYER ----------------
 class Player(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, world):
         super().__init__()
-        global sprite_sheet_path
-
-        self.sheet = pygame.image.load(sprite_sheet_path).convert_alpha()
-
-        # These sizes work with your current sheets
-        self.frame_width  = 32
-        self.frame_height = 32
-
-        sheet_width, sheet_height = self.sheet.get_size()
-        self.cols = sheet_width // self.frame_width
-        self.rows = sheet_height // self.frame_height
-
-        self.animations = []
-        for col in range(self.cols):
-            column_frames = []
-            for row in range(self.rows):
-                x = col * self.frame_width
-                y = row * self.frame_height
-                frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-                frame.blit(self.sheet, (0, 0), (x, y, self.frame_width, self.frame_height))
-                frame = pygame.transform.scale(frame, (64, 64))
-                column_frames.append(frame)
-            self.animations.append(column_frames)
-
-        self.direction       = "up"
-        self.current_frame   = 0
-        self.animation_speed = 0.2
-        self.image = self.animations[self.get_col()][int(self.current_frame)]
+        self.world = world
 
-        self.rect = self.image.get_rect(center=(SCREEN_WIDTH // 2, int(SCREEN_HEIGHT * 0.75)))
+        # These sizes work with your current sheets: 32x32 frames drawn at 64x64,
+        # one column per direction
+        self.animations = load_sheet_frames(world.skin, 32, 32, (64, 64))
+        self.masks      = frame_masks(self.animations, (64, 64))
+
+        self.direction     = "up"
+        self.current_frame = 0
+        self.frame_time    = 5 / FPS   # walk cycle runs only while moving
+        self.anim_timer    = None
+        self.image = self.animations[self.get_col()][self.current_frame]
+        self.mask  = self.masks[self.get_col()][self.current_frame]
+
+        self.rect = pygame.Rect(0, 0, 64, 64)
+        self.rect.center = (SCREEN_WIDTH // 2, int(SCREEN_HEIGHT * 0.75))
 
         self.hitbox = self.rect.copy()
         self.hitbox.width  = int(self.rect.width * 0.45)
@@ -435,19 +416,19 @@ class Player(pygame.sprite.Sprite):
         direction_map = {"down": 1, "left": 3, "right": 0, "up": 2}
         return direction_map[self.direction]
 
-    def move(self):
-        global camera_y
-        pressed = pygame.key.get_pressed()
+    def move(self, pressed):
+        # `pressed` is pygame.key.get_pressed() or anything indexable by K_* keys
+        world = self.world
         moved = False
 
-        if not boss_mode:
+        if not world.boss_mode:
             if pressed[K_w]:
-                camera_y -= self.move_speed
+                world.camera_y -= self.move_speed
                 self.direction = "up"
                 moved = True
 
             if pressed[K_s]:
-                camera_y += self.move_speed
+                world.camera_y += self.move_speed
                 self.direction = "down"
                 moved = True
         else:
@@ -471,67 +452,122 @@ class Player(pygame.sprite.Sprite):
             self.direction = "right"
             moved = True
 
-        if not boss_mode:
-            if camera_y < 0:
-                camera_y += BG_HEIGHT
-            elif camera_y > BG_HEIGHT:
-                camera_y -= BG_HEIGHT
+        if not world.boss_mode:
+            if world.camera_y < 0:
+                world.camera_y += BG_HEIGHT
+            elif world.camera_y > BG_HEIGHT:
+                world.camera_y -= BG_HEIGHT
 
         if moved:
-            self.current_frame += self.animation_speed
-            if self.current_frame >= len(self.animations[self.get_col()]):
-                self.current_frame = 0
-        else:
+            if self.anim_timer is None:
+                self.next_frame(advance=False)
+        elif self.anim_timer is not None:
+            self.anim_timer.cancel()
+            self.anim_timer = None
             self.current_frame = 0
 
-        self.image = self.animations[self.get_col()][int(self.current_frame)]
+        self.image = self.animations[self.get_col()][self.current_frame]
+        self.mask  = self.masks[self.get_col()][self.current_frame]
         self.hitbox.center = self.rect.center
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
-        if DEBUG_HITBOX:
-            pygame.draw.rect(surface, BLUE, self.hitbox, 1)
+    def next_frame(self, advance=True):
+        if advance:
+            self.current_frame = (self.current_frame + 1) % len(self.animations[self.get_col()])
+        self.anim_timer = self.world.timers.call_later(
+            self.frame_time * self.world.quality["anim_div"], self.next_frame)
 
 
 # ---------------- HELPERS ----------------
-def build_enemies():
-    enemies = pygame.sprite.Group()
-    lane_spacing = 120
+@lru_cache(maxsize=None)
+def load_sheet_frames(path, frame_w, frame_h, size):
+    """Frames of a sprite sheet as [column][row], cut once and shared by every sprite."""
+    sheet = load_image(path)
+    sheet_w, sheet_h = sheet.get_size()
+    return [
+        [cut_frame(sheet, (col * frame_w, row * frame_h, frame_w, frame_h), size, RENDER_SCALE)
+         for row in range(sheet_h // frame_h)]
+        for col in range(sheet_w // frame_w)
+    ]
+
+@lru_cache(maxsize=None)
+def load_car_image(path, flipped):
+    """Car image (flipped for left-bound lanes) and its on-screen size, loaded once."""
+    image = load_image(path)
+    if flipped:
+        image = pygame.transform.flip(image, True, False)
+    return to_canvas(image, RENDER_SCALE), image.get_size()
+
+@lru_cache(maxsize=None)
+def bullet_image():
+    radius = 8 // RENDER_SCALE
+    image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(image, RED, (radius, radius), radius)
+    return image
+
+@lru_cache(maxsize=64)
+def hud_label(text):
+    """HUD text changes a few times a second at most; don't re-render it every frame."""
+    return font_small.render(text, True, BLACK)
+
+@lru_cache(maxsize=None)
+def road_color():
+    """Flat road colour used when the governor drops background detail."""
+    return pygame.transform.average_color(background)
+
+def lane_of(world_y):
+    return int(world_y % BG_HEIGHT) // LANE_HEIGHT
+
+def hits(a, b):
+    if PIXEL_COLLISION:
+        return collide_pixels(a, b)
+    return collide_hitboxes(a, b)
+
+def build_enemies(world):
+    enemies = LaneGroup(BG_HEIGHT, LANE_HEIGHT)
+    lane_spacing = LANE_HEIGHT
     num_lanes = int(BG_HEIGHT / lane_spacing)
     for i in range(num_lanes):
         lane_y    = BG_HEIGHT - 200 - (i * lane_spacing)
         direction = "right" if i % 2 == 0 else "left"
-        enemy_type = random.choice(ENEMY_TYPES)
-        enemies.add(Enemy(lane_y, direction, enemy_type))
+        enemy_type = world.rng.choice(ENEMY_TYPES)
+        enemies.add(Enemy(world, lane_y, direction, enemy_type))
     return enemies
 
-def build_objects():
-    objects = pygame.sprite.Group()
+def build_objects(world):
+    objects = LaneGroup(BG_HEIGHT, LANE_HEIGHT)
     lane_spacing = 800
     num_lanes = int(BG_HEIGHT / lane_spacing)
     for i in range(num_lanes):
         lane_y = BG_HEIGHT - 200 - (i * lane_spacing)
-        objects.add(Object(lane_y))
+        objects.add(Object(world, lane_y))
     return objects
 
-def build_boss():
+def build_boss(world):
     boss_group = pygame.sprite.Group()
     lane_y = BG_HEIGHT - 200
-    boss_sprite = Boss(lane_y)
+    boss_sprite = Boss(world, lane_y)
     boss_group.add(boss_sprite)
     return boss_group
 
+SOUNDS = {}
+
+def play_sound(path):
+    if not pygame.mixer.get_init():
+        return      # no audio device
+    sound = SOUNDS.get(path)
+    if sound is None:
+        sound = SOUNDS[path] = pygame.mixer.Sound(path)
+    sound.play()
+
 def draw_text_center(text, font, color, y_offset=0):
     label = font.render(text, True, color)
     rect  = label.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + y_offset))
     DISPLAYSURF.blit(label, rect)
 
 def load_preview_frame(path, frame_w=32, frame_h=32, scale=64):
-    sheet = pygame.image.load(path).convert_alpha()
-    frame = pygame.Surface((frame_w, frame_h), pygame.SRCALPHA)
-    frame.blit(sheet, (0, 0), (0, 0, frame_w, frame_h))
-    frame = pygame.transform.scale(frame, (scale, scale))
-    return frame
+    # shop previews are UI, drawn on the logical-resolution screen
+    sheet = load_image(path)
+    return cut_frame(sheet, (0, 0, frame_w, frame_h), (scale, scale))
 
 
 # ---------------- GAME SCREENS ----------------
@@ -550,7 +586,7 @@ def menu_screen(player_id, username):
         draw_text_center("Press SPACE to Play",font_med,   GREEN, 110)
         draw_text_center("Press Q to Quit",    font_small, RED,   150)
 
-        pygame.display.update()
+        RENDERER.present_screen()
 
         for event in pygame.event.get():
             if event.type == QUIT:
@@ -574,7 +610,7 @@ def game_over_screen(player_id, username, score):
         draw_text_center(f"All-Time High: {high_score}", font_small, YELLOW, 40)
         draw_text_center("Press R to Return to Menu", font_small, WHITE, 100)
         draw_text_center("Press Q to Quit",           font_small, WHITE, 130)
-        pygame.display.update()
+        RENDERER.present_screen()
 
         for event in pygame.event.get():
             if event.type == QUIT:
@@ -655,7 +691,7 @@ def shop_screen(player_id, username):
 
         draw_text_center("Press R to Return", font_small, RED, 150)
 
-        pygame.display.update()
+        RENDERER.present_screen()
 
         for event in pygame.event.get():
             if event.type == QUIT:
@@ -691,91 +727,260 @@ def shop_screen(player_id, username):
                         sprite_sheet_path = "plane_4x4_single.png"
 
 
-# ---------------- MAIN GAME LOGIC ----------------
-def play_game(player_id, username):
-    global camera_y, last_camera_y
-    global boss_mode
-    global projectiles
-
-    COINS       = 0
-    DISTANCE    = 0
-    DIST_SCORE  = 0
-    BONUS_SCORE = 0
-    SCORE       = 0
-    boss_mode = False
-    boss_defeated = False
-
-    camera_y      = BG_HEIGHT - SCREEN_HEIGHT
-    last_camera_y = camera_y
-
-    enemies = build_enemies()
-    objects = build_objects()
-    boss    = build_boss()
-    P1      = Player()
-    projectiles.empty()
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-
-        P1.move()
-        enemies.update()
-        objects.update()
-        if boss_mode:
-            boss.update()
-            projectiles.update()
+# ---------------- WORLD ----------------
+class World:
+    """Everything that belongs to one run: camera, boss state, sprites, score, RNG.
+
+    Entities are handed the world they live in instead of reaching for module
+    globals, so any number of worlds can be stepped side by side in one
+    process (batched evaluation, tests). step() runs one frame of simulation
+    from a key state and needs no window; draw_world() renders one.
+    """
+
+    def __init__(self, skin=None, seed=None, governor=None, events=None):
+        self.rng      = random.Random(seed)
+        self.skin     = skin or sprite_sheet_path
+        self.governor = governor    # QualityGovernor, or None for full quality
+        self.events   = events      # telemetry EventLog, or None
+
+        self.camera_y      = BG_HEIGHT - SCREEN_HEIGHT
+        self.last_camera_y = self.camera_y
+        self.boss_mode     = False
+        self.boss_defeated = False
+        self.frame         = 0
+
+        self.coins       = 0
+        self.distance    = 0
+        self.dist_score  = 0
+        self.bonus_score = 0
+        self.score       = 0
+        self.dead        = None     # cause of death once the run is over
+
+        # timed/periodic callbacks for every entity, advanced in step()
+        self.timers = Scheduler()
+        self.bullets = BulletPool(BG_HEIGHT, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.particles = ParticleSystem(BG_HEIGHT, scale=RENDER_SCALE, seed=seed)
+        self.draw_list = DrawList(LAYERS)
+        self.enemies = build_enemies(self)
+        self.objects = build_objects(self)
+        self.boss    = build_boss(self)
+        self.player  = Player(self)
+        self.schedule_coin()
+
+    @property
+    def quality(self):
+        return self.governor.settings if self.governor is not None else LEVELS[0]
+
+    # ---- telemetry ----
+    def log(self, kind, x=None, y=None, detail=None):
+        """Record a telemetry event at a world position (never blocks)."""
+        if self.events is not None:
+            self.events.emit(kind, x, y, None if y is None else lane_of(y), detail)
+
+    def log_player(self, kind, detail=None):
+        P1 = self.player
+        self.log(kind, P1.rect.centerx, self.camera_y + P1.rect.centery, detail)
+
+    # ---- simulation ----
+    def nearby(self, group):
+        """Sprites in the lanes the player overlaps; the rect covers hitbox and mask."""
+        P1 = self.player
+        return group.near(self.camera_y + P1.rect.top, P1.rect.height)
+
+    def schedule_coin(self):
+        # extra coins arrive at random (Poisson) times, COIN_RATE a second on average
+        rate = COIN_RATE * self.quality["coin_density"]
+        self.coin_timer = self.timers.call_later(self.rng.expovariate(rate), self.spawn_coin)
+
+    def spawn_coin(self):
+        if len(self.objects) < 10:
+            self.objects.add(Object(self, self.rng.randint(0, BG_HEIGHT)))
+        self.schedule_coin()
+
+    def effect(self, name, x, y):
+        self.particles.burst(name, x, y, self.quality["particles"])
+
+    def die(self, cause):
+        self.log_player("death", detail=f"{cause} score:{self.score}")
+        P1 = self.player
+        self.effect("crash", P1.rect.centerx, self.camera_y + P1.rect.centery)
+        if self.events is not None:
+            self.events.flush()
+        self.dead = cause
+        return cause
+
+    # ---- snapshots ----
+    def save_state(self, snap):
+        """Copy everything step() depends on into `snap` (a snapshot.Snapshot)."""
+        snap.skin = self.skin
+        snap.dead = self.dead
+        for i, (name, _) in enumerate(WORLD_FIELDS):
+            snap.world[i] = getattr(self, name)
+        _, words, snap.gauss = self.rng.getstate()
+        snap.rng[:] = words
+
+        n = 0
+        for enemy in self.enemies:
+            snap.enemies[n] = (ENEMY_TYPE_INDEX[enemy.type_name], enemy.direction == "left",
+                               enemy.world_x, enemy.world_y, enemy.speed)
+            n += 1
+        snap.n_enemies = n
+
+        coin_index = {}
+        for n, coin in enumerate(self.objects):
+            snap.coins[n] = (coin.world_x, coin.world_y, coin.current_frame)
+            coin_index[coin] = n
+        snap.n_coins = len(coin_index)
+
+        snap.boss_alive = False
+        for bos in self.boss:
+            snap.boss_alive = True
+            for i, (name, _) in enumerate(BOSS_FIELDS):
+                snap.boss[i] = getattr(bos, name)
+
+        P1 = self.player
+        snap.player[:] = (P1.rect.x, P1.rect.y, DIRECTIONS.index(P1.direction), P1.current_frame)
+
+        # timers in firing order, so equal deadlines fire in the same order after a restore
+        snap.clock = self.timers.get_time()
+        n = 0
+        for timer in self.timers.pending():
+            owner, method = timer.callback.__self__, timer.callback.__name__
+            index = 0
+            if owner is self:
+                kind = "world"
+            elif owner is P1:
+                kind = "player"
+            elif isinstance(owner, Boss):
+                kind = "boss"
+            elif owner in coin_index:
+                kind, index = "coin", coin_index[owner]
+            else:
+                continue    # collected coin whose animation is lapsing
+            snap.timers[n] = (TIMER_CODES[kind, method], index, timer.when, timer.interval or 0)
+            n += 1
+        snap.n_timers = n
+
+        bullets = self.bullets
+        k = snap.n_bullets = bullets.count
+        for row, values in zip(snap.bullets, (bullets.x, bullets.y, bullets.vx, bullets.vy)):
+            row[:k] = values[:k]
+        snap.bullets_dropped = bullets.dropped
+        return snap
+
+    def load_state(self, snap):
+        """Put the world back into the state `snap` was taken in (particles are cleared)."""
+        self.skin = snap.skin
+        self.dead = snap.dead
+        for value, (name, kind) in zip(snap.world.tolist(), WORLD_FIELDS):
+            setattr(self, name, kind(value))
+        self.particles.clear()
+
+        # entities are rebuilt; their constructors draw from the RNG, which is restored last
+        self.enemies = LaneGroup(BG_HEIGHT, LANE_HEIGHT)
+        for type_index, left, world_x, world_y, speed in snap.enemies[:snap.n_enemies].tolist():
+            enemy = Enemy(self, int(world_y), "left" if left else "right", ENEMY_TYPES[int(type_index)])
+            enemy.world_x, enemy.speed = int(world_x), int(speed)
+            enemy.place()
+            self.enemies.add(enemy)
+
+        coins = []
+        self.objects = LaneGroup(BG_HEIGHT, LANE_HEIGHT)
+        for world_x, world_y, frame in snap.coins[:snap.n_coins].tolist():
+            coin = Object(self, int(world_y))
+            coin.world_x, coin.current_frame = int(world_x), int(frame)
+            coin.image = coin.frames[coin.current_frame]
+            coin.mask  = coin.masks[coin.current_frame]
+            coin.place()
+            self.objects.add(coin)
+            coins.append(coin)
+
+        boss = None
+        self.boss = pygame.sprite.Group()
+        if snap.boss_alive:
+            self.boss = build_boss(self)
+            boss = next(iter(self.boss))
+            for value, (name, kind) in zip(snap.boss.tolist(), BOSS_FIELDS):
+                setattr(boss, name, kind(value))
+            boss.image = boss.frames[boss.current_frame]
+            boss.mask  = boss.masks[boss.current_frame]
+            boss.place()
+
+        P1 = self.player
+        x, y, direction, frame = (int(v) for v in snap.player)
+        P1.rect.topleft = (x, y)
+        P1.hitbox.center = P1.rect.center
+        P1.direction, P1.current_frame, P1.anim_timer = DIRECTIONS[direction], frame, None
+        P1.image = P1.animations[P1.get_col()][frame]
+        P1.mask  = P1.masks[P1.get_col()][frame]
+
+        clock = self.timers
+        clock.clear()
+        clock.set_time(*snap.clock)
+        for code, index, when, interval in snap.timers[:snap.n_timers].tolist():
+            kind, method = TIMER_CALLBACKS[int(code)]
+            owner = coins[int(index)] if kind == "coin" else {"world": self, "player": P1, "boss": boss}[kind]
+            timer = clock.call_at(when, getattr(owner, method), interval=interval or None)
+            if kind == "world":
+                self.coin_timer = timer
+            elif kind == "player":
+                P1.anim_timer = timer
+            elif kind == "boss":
+                boss.timers[BOSS_TIMER_NAMES[method]] = timer
+
+        bullets = self.bullets
+        k = bullets.count = snap.n_bullets
+        for row, values in zip(snap.bullets, (bullets.x, bullets.y, bullets.vx, bullets.vy)):
+            values[:k] = row[:k]
+        bullets.dropped = snap.bullets_dropped
+
+        self.rng.setstate((3, tuple(snap.rng.tolist()), snap.gauss))
+
+    def step(self, pressed, dt=1 / FPS):
+        """Advance one frame (`dt` seconds) with the given key state; returns the cause of death or None."""
+        if self.dead:
+            return self.dead
+        self.frame += 1
+        if self.events is not None:
+            self.events.tick()
+
+        P1 = self.player
+        P1.move(pressed)
+        self.particles.update()
+        self.enemies.update()
+        self.objects.update()
+        if self.boss_mode:
+            self.boss.update()
+            self.bullets.update(self.camera_y)
+        self.timers.advance(dt)
 
         # distance / score only when not in boss mode
-        if camera_y < last_camera_y and not boss_mode:
-            DISTANCE += (last_camera_y - camera_y)
-            DIST_SCORE = int(DISTANCE / 50)
-        SCORE = DIST_SCORE + BONUS_SCORE
+        if self.camera_y < self.last_camera_y and not self.boss_mode:
+            self.distance += (self.last_camera_y - self.camera_y)
+            self.dist_score = int(self.distance / 50)
+        self.score = self.dist_score + self.bonus_score
 
         # Start boss once, when score high enough
-        if SCORE >= 200 and (not boss_mode) and (not boss_defeated):
-            boss_mode = True
-            for bos in boss:
-                bos.world_y = camera_y + 50
-
-        last_camera_y = camera_y
-
-        # Draw background (tiled)
-        scroll_y = camera_y % BG_HEIGHT
-        DISPLAYSURF.blit(background, (0, -scroll_y))
-        DISPLAYSURF.blit(background, (0, BG_HEIGHT - scroll_y))
-
-        # Draw everything
-        for enemy in enemies:
-            enemy.draw(DISPLAYSURF, camera_y)
-        for obj in objects:
-            obj.draw(DISPLAYSURF, camera_y)
-        if boss_mode:
-            for bos in boss:
-                bos.draw(DISPLAYSURF, camera_y)
-            for proj in projectiles:
-                proj.draw(DISPLAYSURF, camera_y)
-        P1.draw(DISPLAYSURF)
-
-        # HUD
-        score_label = font_small.render(f"Score: {SCORE}", True, BLACK)
-        coin_label  = font_small.render(f"Coins: {COINS}", True, BLACK)
-        DISPLAYSURF.blit(score_label, (10, 10))
-        DISPLAYSURF.blit(coin_label,  (10, 40))
+        if self.score >= 200 and (not self.boss_mode) and (not self.boss_defeated):
+            self.boss_mode = True
+            for bos in self.boss:
+                bos.world_y = self.camera_y + 50
+                bos.place()
+                bos.activate()
+            self.log_player("boss_start")
+
+        self.last_camera_y = self.camera_y
 
         # Collisions with cars → game over
-        for enemy in enemies:
-            if P1.hitbox.colliderect(enemy.hitbox):
-                pygame.mixer.Sound('crash.wav').play()
-                save_score(player_id, SCORE, DISTANCE, COINS)
-                game_over_screen(player_id, username, SCORE)
-                return
+        for enemy in self.nearby(self.enemies):
+            if hits(P1, enemy):
+                self.log_player("collision", detail=enemy.type_name)
+                return self.die(f"car:{enemy.type_name}")
 
         # Collisions with boss
-        if boss_mode:
-            for bos in list(boss):
-                if P1.hitbox.colliderect(bos.hitbox):
+        if self.boss_mode:
+            for bos in list(self.boss):
+                if hits(P1, bos):
                     if bos.is_vulnerable:
                         # boss has collision: we push the player out instead of dying
                         dx = P1.hitbox.centerx - bos.hitbox.centerx
@@ -795,56 +1000,302 @@ def play_game(player_id, username):
                         # Only first hit per phase does damage
                         if not bos.took_hit_this_phase:
                             boss_dead = bos.take_hit()
+                            self.log_player("boss_hit", detail=f"hp:{bos.hp}")
+                            self.effect("boss_hit", bos.world_x + bos.rect.width // 2,
+                                        bos.world_y + bos.rect.height // 2)
                             if boss_dead:
-                                boss_mode = False
-                                boss_defeated = True
-                                projectiles.empty()
+                                self.log_player("boss_defeated")
+                                self.boss_mode = False
+                                self.boss_defeated = True
+                                self.bullets.clear()
+                                bos.stop()
                                 bos.kill()
                                 # >>> REBUILD CARS + COINS AFTER BOSS <<<
-                                enemies = build_enemies()
-                                objects = build_objects()
+                                # empty the old groups first: a coin still alive() keeps re-arming its animation
+                                self.enemies.empty()
+                                self.objects.empty()
+                                self.enemies = build_enemies(self)
+                                self.objects = build_objects(self)
                     else:
                         # boss not vulnerable → player dies
-                        pygame.mixer.Sound('crash.wav').play()
-                        save_score(player_id, SCORE, DISTANCE, COINS)
-                        game_over_screen(player_id, username, SCORE)
-                        return
+                        self.log_player("collision", detail="boss")
+                        return self.die("boss")
 
         # Collisions with boss projectiles → game over
-        if boss_mode:
-            for proj in list(projectiles):
-                if P1.hitbox.colliderect(proj.hitbox):
-                    pygame.mixer.Sound('crash.wav').play()
-                    save_score(player_id, SCORE, DISTANCE, COINS)
-                    game_over_screen(player_id, username, SCORE)
-                    return
+        if self.boss_mode and self.bullets.hit(P1.hitbox, self.camera_y):
+            self.log_player("collision", detail="projectile")
+            return self.die("projectile")
 
         # Collisions with coins
-        for obj in list(objects):
-            if P1.hitbox.colliderect(obj.hitbox):
-                if not boss_mode:
-                    COINS += 1
-                objects.remove(obj)
-
-        # Random extra coins
-        if len(objects) < 10 and random.random() < 0.02:
-            lane_y = random.randint(0, BG_HEIGHT)
-            objects.add(Object(lane_y))
-
-        pygame.display.update()
+        for obj in self.nearby(self.objects):
+            if hits(P1, obj):
+                if not self.boss_mode:
+                    self.coins += 1
+                    self.log("coin", obj.rect.centerx, obj.world_y + obj.rect.height // 2)
+                    self.effect("coin", obj.rect.centerx, obj.world_y + obj.rect.height // 2)
+                self.objects.remove(obj)
+
+        return None
+
+
+def draw_world(world, renderer):
+    """Gather the visible sprites into the world's DrawList and submit it in one go.
+
+    Sprite rects and hitboxes are already in screen space (step() places
+    them), so drawing is read-only and costs a tuple per visible sprite.
+    """
+    dl = world.draw_list
+    dl.clear()
+    camera_y = world.camera_y
+
+    # Background (tiled)
+    scroll_y = camera_y % BG_HEIGHT
+    if world.quality["background"]:
+        dl.add(LAYER_ROAD, background, (0, -scroll_y))
+        dl.add(LAYER_ROAD, background, (0, BG_HEIGHT - scroll_y))
+    else:
+        dl.fill = road_color()
+
+    # rect.top is already wrapped into [0, BG_HEIGHT)
+    dl.extend(LAYER_CARS,  [(e.image, e.rect) for e in world.enemies if e.rect.top < SCREEN_HEIGHT])
+    dl.extend(LAYER_COINS, [(o.image, o.rect) for o in world.objects if o.rect.top < SCREEN_HEIGHT])
+    if world.boss_mode:
+        dl.extend(LAYER_BOSS, [(b.frame_image(), b.rect) for b in world.boss if b.rect.top < SCREEN_HEIGHT])
+        image = bullet_image()
+        dl.extend(LAYER_BULLETS, [(image, p) for p in world.bullets.positions(camera_y).tolist()])
+    P1 = world.player
+    dl.add(LAYER_PLAYER, P1.image, P1.rect)
+    dl.extend(LAYER_EFFECTS, world.particles.commands(camera_y))
+
+    if DEBUG_HITBOX and world.quality["overlays"]:
+        for sprite in (*world.enemies, *world.objects, *(world.boss if world.boss_mode else ())):
+            dl.rect(RED, sprite.hitbox, 1)
+        if world.boss_mode:
+            for box in world.bullets.hitboxes(camera_y):
+                dl.rect(YELLOW, box, 1)
+        dl.rect(BLUE, P1.hitbox, 1)
+
+    renderer.submit(dl)
+
+
+def draw_hud(world, renderer):
+    renderer.blit_overlay(hud_label(f"Score: {world.score}"), (10, 10))
+    renderer.blit_overlay(hud_label(f"Coins: {world.coins}"), (10, 40))
+
+
+def crash_screen(world):
+    """Hold the final frame for a moment while the crash effect plays out."""
+    for _ in range(CRASH_FRAMES):
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                pygame.quit()
+                sys.exit()
+        world.particles.update()
+        draw_world(world, RENDERER)
+        RENDERER.present()
         FramePerSec.tick(FPS)
 
 
+def end_run_diagnostics():
+    """Screen transition after a run: the deferred collection happens here."""
+    if PROFILER is not None:
+        PROFILER.stop()
+        print("\n".join(PROFILER.report()))
+    if LATENCY is not None:
+        print("\n".join(LATENCY.report()))
+    if GC_POLICY is not None:
+        GC_POLICY.end_play()
+
+
+# ---------------- CHECKPOINTS ----------------
+def save_checkpoint(world, snap, player_id, assisted):
+    world.save_state(snap)
+    snap.save(CHECKPOINT_FILE, player_id=player_id, assisted=assisted)
+
+def load_checkpoint(player_id):
+    """State of this player's run if the last session ended in the middle of it."""
+    if CHECKPOINT_FILE is None or not os.path.exists(CHECKPOINT_FILE):
+        return None
+    try:
+        snap = Snapshot.load(CHECKPOINT_FILE)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ignoring unreadable checkpoint ({e})")
+        return None
+    return snap if snap.meta.get("player_id") == player_id else None
+
+def clear_checkpoint():
+    if CHECKPOINT_FILE is not None and os.path.exists(CHECKPOINT_FILE):
+        os.remove(CHECKPOINT_FILE)
+
+
+# ---------------- MAIN GAME LOGIC ----------------
+def play_game(player_id, username, resume=None):
+    """One run, from scratch or from a checkpoint Snapshot (`resume`)."""
+    if TELEMETRY is not None:
+        TELEMETRY.start_run(player_id)
+    seed  = random.randrange(2 ** 32)
+    world = World(skin=sprite_sheet_path, seed=seed, governor=GOVERNOR, events=TELEMETRY)
+    recording = Recording(seed, world.skin, level=GOVERNOR.level) if RECORD_REPLAYS else None
+    assisted  = False       # rewound or practised: not scored
+    if resume is not None:
+        world.load_state(resume)
+        recording = None    # inputs before the checkpoint are gone
+        assisted  = resume.meta.get("assisted", False)
+        world.log_player("run_resume", detail=world.skin)
+    else:
+        world.log_player("run_start", detail=world.skin)
+    rewind     = RewindBuffer(every=FPS // 2) if REWIND_ENABLED else None   # 10 s of history
+    boss_start = None       # PRACTICE_BOSS restarts the fight from here
+    checkpoint = Snapshot() if CHECKPOINT_FILE is not None else None
+    if GC_POLICY is not None:
+        GC_POLICY.begin_play()
+    if PROFILER is not None:
+        PROFILER.start()
+    if PACER is not None:
+        PACER.reset()
+
+    while True:
+        if PACER is not None:
+            PACER.wait_for_input()
+        if PROFILER is not None:
+            PROFILER.begin_frame()
+        events = pygame.event.get()
+        if LATENCY is not None:
+            LATENCY.polled(events)
+        for event in events:
+            if event.type == QUIT:
+                clear_checkpoint()      # only a crash leaves a run to resume
+                pygame.quit()
+                sys.exit()
+            if event.type == KEYDOWN and event.key == K_BACKSPACE and rewind is not None:
+                if rewind.rewind(world, REWIND_SECONDS * FPS) is not None:
+                    assisted, recording = True, None
+
+        pressed = pygame.key.get_pressed()
+        if recording is not None:
+            recording.add(pressed, GOVERNOR.level)
+        # fixed 1/FPS step: replays, exports and snapshots re-simulate frame by frame
+        dead = world.step(pressed)
+        if LATENCY is not None:
+            LATENCY.stepped()
+        if dead and boss_start is not None and world.boss_mode:
+            play_sound("crash.wav")
+            crash_screen(world)
+            world.load_state(boss_start)
+            assisted, recording = True, None
+            if PACER is not None:
+                PACER.reset()
+            continue
+        if dead:
+            play_sound("crash.wav")
+            clear_checkpoint()
+            if not assisted:
+                save_score(player_id, world.score, world.distance, world.coins)
+            if recording is not None:
+                save_replay(player_id, world.score, recording)
+            crash_screen(world)
+            end_run_diagnostics()
+            game_over_screen(player_id, username, world.score)
+            return
+
+        if rewind is not None:
+            rewind.record(world)
+        if PRACTICE_BOSS and world.boss_mode and boss_start is None:
+            boss_start = world.save_state(Snapshot())
+        if checkpoint is not None and world.frame % (CHECKPOINT_EVERY * FPS) == 0:
+            save_checkpoint(world, checkpoint, player_id, assisted)
+
+        draw_world(world, RENDERER)
+
+        draw_hud(world, RENDERER)
+        if SHOW_PERF:
+            perf = GOVERNOR.stats()
+            perf_label = font_small.render(
+                f"Q{perf['level']}  {perf['avg_ms']:.1f}/{perf['p90_ms']:.1f} ms", True, BLACK)
+            RENDERER.blit_overlay(perf_label, (10, 70))
+
+        RENDERER.present()
+        if LATENCY is not None:
+            LATENCY.presented()
+        if PROFILER is not None:
+            PROFILER.end_frame()
+        if GC_POLICY is not None:
+            GC_POLICY.frame()
+        if PACER is not None:
+            PACER.frame_done()
+            work_ms = PACER.work_ms
+        else:
+            FramePerSec.tick(FPS)
+            # raw time = work done last frame, excluding tick's sleep
+            work_ms = FramePerSec.get_rawtime()
+        if ADAPTIVE_QUALITY:
+            GOVERNOR.record(work_ms)
+
+
+# ---------------- STARTUP WARM-UP ----------------
+SKIN_SHEETS = [
+    "Porcupine - sprite sheet.png",
+    "Peacock-walk-Sheet.png",
+    "robotgood.png",
+    "plane_4x4_single.png",
+]
+HUD_GLYPHS = "0123456789 ScoreCinsHgh:GamePlydAvTrMuQSPACE!✓—"
+
+def _warm_sheet(path, frame_w, frame_h, size, image):
+    adopt_image(path, image)
+    frame_masks(load_sheet_frames(path, frame_w, frame_h, size), size)
+
+def _warm_car(path, image):
+    adopt_image(path, image)
+    for flipped in (False, True):
+        frame_mask(*load_car_image(path, flipped))
+
+def _warm_sound(path, sound):
+    SOUNDS[path] = sound
+
+def _warm_fonts(glyphs):
+    # fills the glyph caches for the HUD/menu text
+    for font in (font_large, font_med, font_small):
+        font.render(glyphs, True, BLACK)
+
+def start_warmup():
+    """Decode every asset the first run needs, and warm the DB, on worker threads."""
+    loader = Preloader()
+    loader.add("db", warm_up_db)
+
+    sheets = [("idle_32x32_4rows.png", 32, 32, (96, 96)), ("coin1_16x16.png", 16, 16, (32, 32))]
+    sheets += [(path, 32, 32, (64, 64)) for path in SKIN_SHEETS]
+    for path, frame_w, frame_h, size in sheets:
+        loader.add(path, partial(pygame.image.load, path),
+                   partial(_warm_sheet, path, frame_w, frame_h, size))
+    for path in sorted({t["image"] for t in ENEMY_TYPES}):
+        loader.add(path, partial(pygame.image.load, path), partial(_warm_car, path))
+
+    if pygame.mixer.get_init():
+        loader.add("crash.wav", partial(pygame.mixer.Sound, "crash.wav"), partial(_warm_sound, "crash.wav"))
+    loader.add("fonts", lambda: HUD_GLYPHS, _warm_fonts)
+    return loader
+
+
 # ---------------- LOGIN ----------------
-def login_screen():
+def login_screen(loader=None):
     username = ""
     entering = True
     while entering:
+        if loader is not None:
+            loader.poll()
+
         DISPLAYSURF.fill(WHITE)
         draw_text_center("Enter Your Name:", font_med, BLACK, -40)
         draw_text_center(username + "_",     font_large, GREEN, 20)
         draw_text_center("Press ENTER to continue", font_small, BLACK, 100)
-        pygame.display.update()
+        if loader is not None and not loader.done:
+            done, total = loader.progress
+            draw_text_center(f"Loading {done}/{total}", font_small, BLUE, 150)
+        RENDERER.present_screen()
+        first_frame()
+        # idle screen: don't spin, leave the CPU to the warm-up workers
+        FramePerSec.tick(FPS)
 
         for event in pygame.event.get():
             if event.type == QUIT:
@@ -861,10 +1312,71 @@ def login_screen():
     return username.strip()
 
 
+# ---------------- INITIALIZATION ----------------
+def init(window=True):
+    """Start pygame and load what every screen shares; safe to call again.
+
+    window=False is for headless users (env.py, export.py): no display,
+    audio or telemetry, just fonts and the road, which is all World and
+    offscreen rendering need. Create the window first if you want one, so
+    the road gets converted to the display format.
+    """
+    global RENDERER, DISPLAYSURF, TELEMETRY, background, BG_HEIGHT
+
+    if window and RENDERER is None:
+        with STARTUP.phase("display"):
+            # only the subsystems the game uses, not everything pygame.init() starts
+            pygame.display.init()
+            try:
+                pygame.mixer.init()
+            except pygame.error as e:
+                print(f"Sound disabled ({e})")
+        with STARTUP.phase("window"):
+            RENDERER = create_renderer(RENDER_BACKEND, (SCREEN_WIDTH, SCREEN_HEIGHT), "Porcupine Infinite Road",
+                                       scale=RENDER_SCALE, window_size=WINDOW_SIZE, fullscreen=FULLSCREEN,
+                                       smooth=SCALE_FILTER == "smooth")
+            DISPLAYSURF = RENDERER.screen
+        if TELEMETRY_ENABLED and TELEMETRY is None:
+            TELEMETRY = EventLog()
+
+    if background is None:
+        with STARTUP.phase("fonts"):
+            load_fonts()
+        with STARTUP.phase("background"):
+            background = to_canvas(load_image("scrol road.png", alpha=False), RENDER_SCALE)
+            BG_HEIGHT  = background.get_height() * RENDER_SCALE
+    return STARTUP
+
+def load_fonts():
+    global font_large, font_med, font_small
+    pygame.font.init()
+    font_large = pygame.font.Font(FONT_FILE, 60)
+    font_med   = pygame.font.Font(FONT_FILE, 30)
+    font_small = pygame.font.Font(FONT_FILE, 20)
+
+def first_frame():
+    if "first frame" not in STARTUP.marks:
+        STARTUP.mark("first frame")
+        if STARTUP_REPORT:
+            print("\n".join(STARTUP.report()))
+
+
 # ---------------- MAIN LOOP ----------------
 def main():
-    username  = login_screen()
+    init()
+    loader    = start_warmup()
+    username  = login_screen(loader)
+    loader.wait()
+    STARTUP.mark("warm-up done")
     player_id = get_or_create_player(username)
+    if GC_POLICY is not None:
+        # assets, fonts and caches live for the whole session
+        GC_POLICY.startup_done()
+
+    resume = load_checkpoint(player_id)
+    if resume is not None:
+        # the last session stopped mid-run: carry on from its checkpoint
+        play_game(player_id, username, resume)
 
     while True:
         menu_screen(player_id, username)
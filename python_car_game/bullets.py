@@ -0,0 +1,109 @@
+import math
+import numpy as np
+
+
+# ---------------- BULLET POOL ----------------
+class BulletPool:
+    """Boss bullets kept as parallel NumPy arrays instead of one Sprite each.
+
+    Live bullets occupy the first `count` slots of x/y/vx/vy, so moving,
+    culling and hit-testing are a few array operations however many are
+    alive. Positions are bullet centres in world space; like everything else
+    the road wraps every `world_height` pixels. Bullets emitted while the
+    pool is full are dropped (and counted) rather than growing the arrays.
+    """
+
+    def __init__(self, world_height, screen_size, capacity=4096, size=16, hit_scale=0.8):
+        self.world_height = world_height
+        self.screen_w, self.screen_h = screen_size
+        self.capacity = capacity
+        self.half     = size / 2
+        self.half_hit = size * hit_scale / 2
+
+        self.x  = np.zeros(capacity)
+        self.y  = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.count   = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, vx, vy):
+        """Spawn bullets at (x, y) with the given velocities (scalars or arrays)."""
+        x, y, vx, vy = np.broadcast_arrays(*(np.atleast_1d(v).astype(float) for v in (x, y, vx, vy)))
+        n, start = len(vx), self.count
+        k = min(n, self.capacity - start)
+        self.dropped += n - k
+        end = start + k
+        self.x[start:end]  = x[:k]
+        self.y[start:end]  = y[:k]
+        self.vx[start:end] = vx[:k]
+        self.vy[start:end] = vy[:k]
+        self.count = end
+
+    def _screen_y(self, camera_y):
+        return (self.y[:self.count] - camera_y) % self.world_height
+
+    def update(self, camera_y):
+        """Move every bullet one frame and drop the ones that left the screen."""
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+
+        x, sy, half = self.x[:n], self._screen_y(camera_y), self.half
+        keep = (x + half >= 0) & (x - half <= self.screen_w) & (sy + half >= 0) & (sy - half <= self.screen_h)
+        if not keep.all():
+            k = int(np.count_nonzero(keep))
+            for a in (self.x, self.y, self.vx, self.vy):
+                a[:k] = a[:n][keep]
+            self.count = k
+
+    def hit(self, rect, camera_y):
+        """True if any bullet's hitbox overlaps `rect` (screen space)."""
+        n = self.count
+        if not n:
+            return False
+        x, sy, h = self.x[:n], self._screen_y(camera_y), self.half_hit
+        return bool(np.any((x - h < rect.right) & (x + h > rect.left) &
+                           (sy - h < rect.bottom) & (sy + h > rect.top)))
+
+    def positions(self, camera_y):
+        """(count, 2) int array of bullet top-left corners on screen, for blitting."""
+        pos = np.empty((self.count, 2))
+        pos[:, 0] = self.x[:self.count] - self.half
+        pos[:, 1] = self._screen_y(camera_y) - self.half
+        return pos.astype(int)
+
+    def hitboxes(self, camera_y):
+        """Hitbox rects as (x, y, w, h) tuples, for the debug overlay."""
+        h = self.half_hit
+        size = int(h * 2)
+        return [(int(x - h), int(y - h), size, size)
+                for x, y in zip(self.x[:self.count], self._screen_y(camera_y))]
+
+
+# ---------------- EMITTERS ----------------
+def ring(pool, x, y, count, speed, phase=0.0):
+    """`count` bullets spread evenly around a circle, the first at angle `phase`."""
+    angles = phase + np.arange(count) * (2 * math.pi / count)
+    pool.emit(x, y, speed * np.cos(angles), speed * np.sin(angles))
+
+
+def spiral(pool, x, y, arms, speed, angle, turn=0.25):
+    """One volley of a rotating spiral; returns the angle for the next volley."""
+    ring(pool, x, y, arms, speed, angle)
+    return angle + turn
+
+
+def aimed(pool, x, y, target, count, speed, spread=0.4):
+    """A fan of `count` bullets centred on `target` (world x, y), `spread` radians wide."""
+    base = math.atan2(target[1] - y, target[0] - x)
+    angles = base + (np.linspace(-spread / 2, spread / 2, count) if count > 1 else np.zeros(1))
+    pool.emit(x, y, speed * np.cos(angles), speed * np.sin(angles))
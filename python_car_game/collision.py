@@ -0,0 +1,116 @@
+import weakref
+import pygame
+
+# ---------------- MASKS ----------------
+# Masks are built once per animation frame / flip variant and cached against
+# the frame Surface, so nothing is generated while the game is running.
+_mask_cache = weakref.WeakKeyDictionary()
+
+def frame_mask(image, size=None):
+    """Mask of `image` at `size` (logical pixels), cached per frame Surface."""
+    size = tuple(size or image.get_size())
+    masks = _mask_cache.get(image)
+    if masks is None:
+        masks = _mask_cache[image] = {}
+    mask = masks.get(size)
+    if mask is None:
+        mask = pygame.mask.from_surface(image)
+        if mask.get_size() != size:
+            mask = mask.scale(size)
+        masks[size] = mask
+    return mask
+
+
+def frame_masks(frames, size=None):
+    """Masks for a list of frames (or a list of lists, e.g. Player.animations)."""
+    return [frame_masks(f, size) if isinstance(f, list) else frame_mask(f, size)
+            for f in frames]
+
+
+# ---------------- TESTS ----------------
+def collide_pixels(a, b):
+    """Pixel-accurate test between two sprites with screen-space `rect` and `mask`.
+
+    The full sprite rects are compared first; the masks are only overlapped
+    when they actually touch.
+    """
+    if not a.rect.colliderect(b.rect):
+        return False
+    return a.mask.overlap(b.mask, (b.rect.x - a.rect.x, b.rect.y - a.rect.y)) is not None
+
+
+def collide_hitboxes(a, b):
+    return a.hitbox.colliderect(b.hitbox)
+
+
+# ---------------- LANE INDEX ----------------
+class LaneIndex:
+    """Buckets sprites by the horizontal bands ("lanes") of world space they span.
+
+    The road wraps every `world_height` pixels, so spans are taken modulo it.
+    A sprite is only re-bucketed when the set of lanes it covers changes.
+    """
+
+    def __init__(self, world_height, cell):
+        self.world_height = world_height
+        self.cell    = cell
+        self.buckets = [set() for _ in range(-(-world_height // cell))]
+        self._cells  = {}
+
+    def cells(self, top, height):
+        H, cell = self.world_height, self.cell
+        y = int(top) % H
+        remaining = int(height)
+        found = []
+        while remaining > 0:
+            found.append(y // cell)
+            step = min(cell - y % cell, H - y)
+            y = (y + step) % H
+            remaining -= step
+        return tuple(found)
+
+    def place(self, sprite, top, height):
+        cells = self.cells(top, height)
+        old = self._cells.get(sprite)
+        if old == cells:
+            return
+        if old:
+            for c in old:
+                self.buckets[c].discard(sprite)
+        for c in cells:
+            self.buckets[c].add(sprite)
+        self._cells[sprite] = cells
+
+    def remove(self, sprite):
+        for c in self._cells.pop(sprite, ()):
+            self.buckets[c].discard(sprite)
+
+    def query(self, top, height):
+        found = set()
+        for c in self.cells(top, height):
+            found |= self.buckets[c]
+        return found
+
+
+class LaneGroup(pygame.sprite.Group):
+    """Sprite group that keeps its members in a LaneIndex.
+
+    Sprites provide `lane_span()` -> (world top, height). Cars and coins
+    never change lanes, so they are bucketed once, when added.
+    """
+
+    def __init__(self, world_height, cell, *sprites):
+        self.index = LaneIndex(world_height, cell)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.index.place(sprite, *sprite.lane_span())
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.index.remove(sprite)
+
+    def near(self, top, height):
+        """Sprites whose lanes overlap the world-space band [top, top + height)."""
+        return self.index.query(top, height)
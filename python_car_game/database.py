@@ -1,149 +1,332 @@
+import json
+import math
 import sqlite3
+import threading
 from datetime import datetime
 
 DB_FILE = "game_data.db"
 
-# ---------------- DATABASE INITIALIZATION ----------------
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-
-    # Players table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS players (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL
-        )
-    """)
+# Stored in the file's PRAGMA user_version; bump it whenever init_db() changes
+SCHEMA_VERSION = 1
+
+# Progression analytics (kept up to date by save_score)
+ROLLING_WINDOW   = 10      # games in the rolling average
+SKETCH_ACCURACY  = 0.02    # relative error of score percentiles
+DISTANCE_BIN     = 2500    # px per distance histogram bin (50 score points)
+DISTANCE_BINS    = 20      # last bin collects everything further
+
+# Recorded runs kept for attract mode (best scores win)
+REPLAYS_KEPT     = 20
+
+# One connection shared by the whole game. It may be opened by the warm-up
+# worker thread and used later from the main thread, so same-thread checking
+# is off and every use goes through _conn_lock.
+_conn = None
+_conn_lock = threading.RLock()
+
+def get_connection():
+    """Return the shared connection, opening it (and creating tables if needed) on first use."""
+    global _conn
+    with _conn_lock:
+        if _conn is None:
+            conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+            # one cheap pragma read instead of running the DDL on every start
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                init_db(conn)
+            _conn = conn
+        return _conn
 
-    # Stats table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS stats (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            player_id INTEGER NOT NULL,
-            score INTEGER NOT NULL,
-            distance REAL,
-            coins INTEGER DEFAULT 0,
-            date_played TEXT,
-            FOREIGN KEY (player_id) REFERENCES players (id)
-        )
-    """)
-
-    # Purchases table (new)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS purchases (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            player_id INTEGER NOT NULL,
-            skin_name TEXT NOT NULL,
-            UNIQUE(player_id, skin_name),
-            FOREIGN KEY(player_id) REFERENCES players(id)
-        )
-    """)
+# ---------------- DATABASE INITIALIZATION ----------------
+def init_db(conn):
+    """Create any missing tables and stamp the file with SCHEMA_VERSION."""
+    with _conn_lock:
+        cur = conn.cursor()
+
+        # Players table
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS players (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL
+            )
+        """)
+
+        # Stats table
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_id INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                distance REAL,
+                coins INTEGER DEFAULT 0,
+                date_played TEXT,
+                FOREIGN KEY (player_id) REFERENCES players (id)
+            )
+        """)
+
+        # Purchases table (new)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS purchases (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_id INTEGER NOT NULL,
+                skin_name TEXT NOT NULL,
+                UNIQUE(player_id, skin_name),
+                FOREIGN KEY(player_id) REFERENCES players(id)
+            )
+        """)
+
+        # Gameplay telemetry events (written in batches by telemetry.EventLog)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_id INTEGER NOT NULL,
+                run_id TEXT NOT NULL,
+                frame INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                x REAL,
+                y REAL,
+                lane INTEGER,
+                detail TEXT,
+                FOREIGN KEY(player_id) REFERENCES players(id)
+            )
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS events_run ON events (run_id)")
+
+        # Running per-player aggregates for the analytics API
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS player_aggregates (
+                player_id INTEGER PRIMARY KEY,
+                games INTEGER NOT NULL,
+                best_score INTEGER NOT NULL,
+                recent TEXT NOT NULL,
+                pb_streak INTEGER NOT NULL,
+                best_pb_streak INTEGER NOT NULL,
+                score_sketch TEXT NOT NULL,
+                distance_hist TEXT NOT NULL,
+                FOREIGN KEY(player_id) REFERENCES players(id)
+            )
+        """)
+
+        # Per-day totals for trends
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS daily_stats (
+                player_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                games INTEGER NOT NULL,
+                score_sum INTEGER NOT NULL,
+                best_score INTEGER NOT NULL,
+                distance_sum REAL NOT NULL,
+                coins INTEGER NOT NULL,
+                PRIMARY KEY (player_id, day),
+                FOREIGN KEY(player_id) REFERENCES players(id)
+            )
+        """)
+
+        # Recorded runs: seed + one input byte per frame (see replay.Recording)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS replays (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_id INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                seed INTEGER NOT NULL,
+                skin TEXT NOT NULL,
+                levels TEXT NOT NULL,
+                inputs BLOB NOT NULL,
+                date_played TEXT,
+                FOREIGN KEY(player_id) REFERENCES players(id)
+            )
+        """)
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
 
-    conn.commit()
-    conn.close()
 
+def warm_up():
+    """Open the shared connection and pull the tables into SQLite's page cache.
 
-# Initialize DB on import
-init_db()
+    Run on a worker thread while the login screen is up so the first real
+    queries (player lookup, menu stats) don't pay for cold reads.
+    """
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*), IFNULL(MAX(score), 0), IFNULL(SUM(coins), 0) FROM stats")
+        cur.execute("SELECT COUNT(*) FROM purchases")
+        cur.execute("SELECT COUNT(*) FROM players")
 
 
 # ---------------- PLAYER MANAGEMENT ----------------
 def get_or_create_player(username: str):
     """Get a player's ID, creating a new record if needed."""
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
 
-    cur.execute("SELECT id FROM players WHERE username=?", (username,))
-    row = cur.fetchone()
+        cur.execute("SELECT id FROM players WHERE username=?", (username,))
+        row = cur.fetchone()
 
-    if row:
-        player_id = row[0]
-    else:
-        cur.execute("INSERT INTO players (username) VALUES (?)", (username,))
-        player_id = cur.lastrowid
-        conn.commit()
+        if row:
+            player_id = row[0]
+        else:
+            cur.execute("INSERT INTO players (username) VALUES (?)", (username,))
+            player_id = cur.lastrowid
+            conn.commit()
 
-    conn.close()
     return player_id
 
 
 # ---------------- SCORE SAVING ----------------
 def save_score(player_id: int, score: int, distance: float, coins: int = 0):
     """Save a player's score and distance after each game."""
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+        date_played = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    cur.execute("""
-        INSERT INTO stats (player_id, score, distance, coins, date_played)
-        VALUES (?, ?, ?, ?, ?)
-    """, (player_id, score, distance, coins,
-          datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        # aggregates must reflect history *before* this game
+        agg = _load_aggregates(cur, player_id)
+
+        cur.execute("""
+            INSERT INTO stats (player_id, score, distance, coins, date_played)
+            VALUES (?, ?, ?, ?, ?)
+        """, (player_id, score, distance, coins, date_played))
+
+        _add_game(agg, score, distance)
+        _store_aggregates(cur, player_id, agg)
+        _add_day(cur, player_id, date_played[:10], score, distance, coins)
+
+        conn.commit()
+
+
+# ---------------- TELEMETRY ----------------
+def save_events(rows):
+    """Insert a batch of (player_id, run_id, frame, kind, x, y, lane, detail) rows
+    in a single transaction."""
+    conn = get_connection()
+    with _conn_lock:
+        conn.executemany("""
+            INSERT INTO events (player_id, run_id, frame, kind, x, y, lane, detail)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.commit()
+
+
+# ---------------- REPLAYS ----------------
+def save_replay(player_id: int, score: int, recording):
+    """Store a recorded run, keeping only the REPLAYS_KEPT best overall."""
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+        date_played = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        cur.execute("""
+            INSERT INTO replays (player_id, score, seed, skin, levels, inputs, date_played)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (player_id, score, recording.seed, recording.skin,
+              json.dumps(recording.levels), bytes(recording.inputs), date_played))
+        replay_id = cur.lastrowid
+
+        cur.execute("""
+            DELETE FROM replays WHERE id NOT IN
+                (SELECT id FROM replays ORDER BY score DESC, id LIMIT ?)
+        """, (REPLAYS_KEPT,))
+
+        conn.commit()
+
+    return replay_id
+
+
+def get_top_replays(limit: int = 5):
+    """(replay id, username, score) of the best recorded runs."""
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+
+        cur.execute("""
+            SELECT replays.id, players.username, replays.score
+            FROM replays JOIN players ON players.id = replays.player_id
+            ORDER BY replays.score DESC, replays.id
+            LIMIT ?
+        """, (limit,))
+        rows = cur.fetchall()
+
+    return rows
 
-    conn.commit()
-    conn.close()
+
+def get_replay(replay_id: int):
+    """Return (seed, skin, levels, inputs) of a stored run, or None."""
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+
+        cur.execute("SELECT seed, skin, levels, inputs FROM replays WHERE id=?", (replay_id,))
+        row = cur.fetchone()
+
+    if row is None:
+        return None
+    seed, skin, levels, inputs = row
+    return seed, skin, [tuple(change) for change in json.loads(levels)], inputs
 
 
 # ---------------- SHOP SYSTEM ----------------
 def player_owns_skin(player_id, skin_name):
     """Check if player already owns a skin."""
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
 
-    cur.execute("SELECT 1 FROM purchases WHERE player_id=? AND skin_name=?", (player_id, skin_name))
-    result = cur.fetchone()
+        cur.execute("SELECT 1 FROM purchases WHERE player_id=? AND skin_name=?", (player_id, skin_name))
+        result = cur.fetchone()
 
-    conn.close()
     return result is not None
 
 
 def unlock_skin(player_id, skin_name):
     """Marks a skin as purchased/owned."""
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
 
-    cur.execute("""
-        INSERT OR IGNORE INTO purchases (player_id, skin_name)
-        VALUES (?, ?)
-    """, (player_id, skin_name))
+        cur.execute("""
+            INSERT OR IGNORE INTO purchases (player_id, skin_name)
+            VALUES (?, ?)
+        """, (player_id, skin_name))
 
-    conn.commit()
-    conn.close()
+        conn.commit()
 
 
 def spend_coins(player_id, amount):
     """Subtract coins from the player's total."""
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
 
-    cur.execute("""
-        UPDATE stats
-        SET coins = coins - ?
-        WHERE player_id=?
-    """, (amount, player_id))
+        cur.execute("""
+            UPDATE stats
+            SET coins = coins - ?
+            WHERE player_id=?
+        """, (amount, player_id))
 
-    conn.commit()
-    conn.close()
+        conn.commit()
 
 
 # ---------------- STATS RETRIEVAL ----------------
 def get_player_stats(player_id: int):
     """Return dictionary with high score, total games, average score, and total coins."""
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT 
-            COUNT(*),
-            IFNULL(MAX(score), 0),
-            IFNULL(AVG(score), 0),
-            IFNULL(SUM(coins), 0)
-        FROM stats
-        WHERE player_id=?
-    """, (player_id,))
-
-    result = cur.fetchone()
-    conn.close()
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+
+        cur.execute("""
+            SELECT 
+                COUNT(*),
+                IFNULL(MAX(score), 0),
+                IFNULL(AVG(score), 0),
+                IFNULL(SUM(coins), 0)
+            FROM stats
+            WHERE player_id=?
+        """, (player_id,))
+
+        result = cur.fetchone()
 
     games_played = result[0]
     high_score = result[1]
@@ -156,3 +339,199 @@ def get_player_stats(player_id: int):
         "avg_score": avg_score,
         "coins": coins
     }
+
+
+# ---------------- PROGRESSION ANALYTICS ----------------
+# Everything here is maintained incrementally by save_score: a running
+# aggregate row per player (last-N scores, personal-best streaks, a
+# log-bucketed quantile sketch of scores and a distance histogram) plus one
+# row per player per day. Reads are a primary-key lookup and work over a
+# bounded number of buckets, so they cost the same for 10 or 10,000 games.
+
+_GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+
+
+def _sketch_key(value):
+    # bucket i holds (gamma^(i-1), gamma^i]; scores <= 0 share bucket 0
+    if value <= 0:
+        return 0
+    return max(1, math.ceil(math.log(value, _GAMMA)))
+
+
+def _sketch_quantile(sketch, q):
+    total = sum(sketch.values())
+    if not total:
+        return 0
+    rank = q * (total - 1)
+    seen = 0
+    for key in sorted(sketch, key=int):
+        seen += sketch[key]
+        if seen > rank:
+            key = int(key)
+            return 0 if key == 0 else 2 * _GAMMA ** key / (_GAMMA + 1)
+    return 0
+
+
+def _new_aggregates():
+    return {
+        "games": 0,
+        "best_score": 0,
+        "recent": [],
+        "pb_streak": 0,
+        "best_pb_streak": 0,
+        "score_sketch": {},
+        "distance_hist": [0] * DISTANCE_BINS,
+    }
+
+
+def _add_game(agg, score, distance):
+    agg["games"] += 1
+
+    if score > agg["best_score"]:
+        agg["best_score"] = score
+        agg["pb_streak"] += 1
+        agg["best_pb_streak"] = max(agg["best_pb_streak"], agg["pb_streak"])
+    else:
+        agg["pb_streak"] = 0
+
+    agg["recent"] = (agg["recent"] + [score])[-ROLLING_WINDOW:]
+
+    key = str(_sketch_key(score))
+    agg["score_sketch"][key] = agg["score_sketch"].get(key, 0) + 1
+
+    b = min(int((distance or 0) // DISTANCE_BIN), DISTANCE_BINS - 1)
+    agg["distance_hist"][b] += 1
+
+
+def _load_aggregates(cur, player_id):
+    cur.execute("""
+        SELECT games, best_score, recent, pb_streak, best_pb_streak, score_sketch, distance_hist
+        FROM player_aggregates WHERE player_id=?
+    """, (player_id,))
+    row = cur.fetchone()
+    if row is None:
+        return _rebuild_aggregates(cur, player_id)
+    return {
+        "games":          row[0],
+        "best_score":     row[1],
+        "recent":         json.loads(row[2]),
+        "pb_streak":      row[3],
+        "best_pb_streak": row[4],
+        "score_sketch":   json.loads(row[5]),
+        "distance_hist":  json.loads(row[6]),
+    }
+
+
+def _store_aggregates(cur, player_id, agg):
+    cur.execute("""
+        INSERT OR REPLACE INTO player_aggregates
+            (player_id, games, best_score, recent, pb_streak, best_pb_streak, score_sketch, distance_hist)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (player_id, agg["games"], agg["best_score"], json.dumps(agg["recent"]),
+          agg["pb_streak"], agg["best_pb_streak"], json.dumps(agg["score_sketch"]),
+          json.dumps(agg["distance_hist"])))
+
+
+def _add_day(cur, player_id, day, score, distance, coins):
+    cur.execute("""
+        INSERT INTO daily_stats (player_id, day, games, score_sum, best_score, distance_sum, coins)
+        VALUES (?, ?, 1, ?, ?, ?, ?)
+        ON CONFLICT (player_id, day) DO UPDATE SET
+            games        = games + 1,
+            score_sum    = score_sum + excluded.score_sum,
+            best_score   = MAX(best_score, excluded.best_score),
+            distance_sum = distance_sum + excluded.distance_sum,
+            coins        = coins + excluded.coins
+    """, (player_id, day, score, score, distance or 0, coins or 0))
+
+
+def _rebuild_aggregates(cur, player_id):
+    """One-off replay of a player's existing games (rows saved before analytics existed)."""
+    agg = _new_aggregates()
+    cur.execute("DELETE FROM daily_stats WHERE player_id=?", (player_id,))
+    cur.execute("""
+        SELECT score, distance, coins, date_played FROM stats
+        WHERE player_id=? ORDER BY id
+    """, (player_id,))
+    for score, distance, coins, date_played in cur.fetchall():
+        _add_game(agg, score, distance)
+        _add_day(cur, player_id, (date_played or "")[:10], score, distance, coins)
+    _store_aggregates(cur, player_id, agg)
+    return agg
+
+
+def _aggregates(player_id):
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+        agg = _load_aggregates(cur, player_id)
+        conn.commit()
+    return agg
+
+
+def get_rolling_average(player_id: int):
+    """Average score over the player's last ROLLING_WINDOW games."""
+    recent = _aggregates(player_id)["recent"]
+    return sum(recent) / len(recent) if recent else 0.0
+
+
+def get_score_percentiles(player_id: int, quantiles=(0.5, 0.9, 0.99)):
+    """Approximate score percentiles (within SKETCH_ACCURACY relative error)."""
+    sketch = _aggregates(player_id)["score_sketch"]
+    return {q: _sketch_quantile(sketch, q) for q in quantiles}
+
+
+def get_pb_streaks(player_id: int):
+    """Current and longest run of consecutive games that set a new high score."""
+    agg = _aggregates(player_id)
+    return {"current": agg["pb_streak"], "longest": agg["best_pb_streak"]}
+
+
+def get_distance_histogram(player_id: int):
+    """List of (bin start distance, games) pairs; the last bin is open-ended."""
+    hist = _aggregates(player_id)["distance_hist"]
+    return [(i * DISTANCE_BIN, count) for i, count in enumerate(hist)]
+
+
+def _daily_trend(cur, player_id, days):
+    cur.execute("""
+        SELECT day, games, score_sum, best_score, distance_sum, coins
+        FROM daily_stats WHERE player_id=?
+        ORDER BY day DESC LIMIT ?
+    """, (player_id, days))
+    rows = cur.fetchall()
+    return [
+        {"day": day, "games": games, "avg_score": score_sum / games,
+         "best_score": best, "distance": distance_sum, "coins": coins}
+        for day, games, score_sum, best, distance_sum, coins in reversed(rows)
+    ]
+
+
+def get_daily_trend(player_id: int, days: int = 7):
+    """Per-day games, average/best score, distance and coins for the last `days` days played."""
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+        _load_aggregates(cur, player_id)   # backfills daily_stats for pre-analytics players
+        conn.commit()
+        return _daily_trend(cur, player_id, days)
+
+
+def get_progression(player_id: int):
+    """Everything above in one call (one aggregate read)."""
+    conn = get_connection()
+    with _conn_lock:
+        cur = conn.cursor()
+        agg = _load_aggregates(cur, player_id)
+        conn.commit()
+        daily = _daily_trend(cur, player_id, 7)
+    recent = agg["recent"]
+    return {
+        "games":             agg["games"],
+        "rolling_avg":       sum(recent) / len(recent) if recent else 0.0,
+        "percentiles":       {q: _sketch_quantile(agg["score_sketch"], q) for q in (0.5, 0.9, 0.99)},
+        "pb_streak":         agg["pb_streak"],
+        "longest_pb_streak": agg["best_pb_streak"],
+        "distance_hist":     [(i * DISTANCE_BIN, c) for i, c in enumerate(agg["distance_hist"])],
+        "daily":             daily,
+    }
@@ -0,0 +1,136 @@
+import gc
+import sys
+import time
+import tracemalloc
+
+
+# ---------------- ALLOCATION / GC PROFILER ----------------
+class FrameProfiler:
+    """Diagnostics mode: what each gameplay frame allocates and what GC pauses cost.
+
+    Per frame it records the net change in allocated blocks, the tracemalloc
+    peak above the frame's starting memory (allocation churn, even if freed
+    again), and how many GC-tracked containers were created. Every
+    `snapshot_every` frames it diffs a tracemalloc snapshot against the
+    previous one to find the top allocation sites. GC pauses are timed
+    through gc.callbacks. tracemalloc slows everything down, so this is for
+    hunting hitches, not for normal play.
+    """
+
+    def __init__(self, top=10, snapshot_every=300, depth=1):
+        self.top   = top
+        self.snapshot_every = snapshot_every
+        self.depth = depth
+
+        self.frames    = 0
+        self.blocks    = []     # net allocated blocks per frame
+        self.churn     = []     # bytes allocated above the frame's start (peak - start)
+        self.objects   = []     # GC-tracked objects created per frame (gen0 growth)
+        self.gc_pauses = []     # (generation, ms, collected)
+        self.sites     = {}     # "file:line" -> bytes allocated across snapshot diffs
+
+        self._gc_start = None
+        self._snapshot = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+        gc.callbacks.append(self._on_gc)
+        self._snapshot = self._take_snapshot()
+
+    def stop(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        tracemalloc.stop()
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),
+             tracemalloc.Filter(False, __file__)))
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            ms = (time.perf_counter() - self._gc_start) * 1000
+            self.gc_pauses.append((info["generation"], ms, info["collected"]))
+            self._gc_start = None
+
+    def begin_frame(self):
+        tracemalloc.reset_peak()
+        self._mem    = tracemalloc.get_traced_memory()[0]
+        self._blocks = sys.getallocatedblocks()
+        self._gen0   = gc.get_count()[0]
+
+    def end_frame(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.churn.append(peak - self._mem)
+        self.blocks.append(sys.getallocatedblocks() - self._blocks)
+        gen0 = gc.get_count()[0]
+        # a gen0 collection in the middle of the frame resets the counter
+        self.objects.append(gen0 - self._gen0 if gen0 >= self._gen0 else gen0)
+        self.frames += 1
+
+        if self.frames % self.snapshot_every == 0:
+            snapshot = self._take_snapshot()
+            for stat in snapshot.compare_to(self._snapshot, "lineno")[:self.top]:
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    site = f"{frame.filename}:{frame.lineno}"
+                    self.sites[site] = self.sites.get(site, 0) + stat.size_diff
+            self._snapshot = snapshot
+
+    def report(self):
+        """Summary lines: per-frame allocation stats, GC pauses, top allocation sites."""
+        if not self.frames:
+            return ["no frames recorded"]
+        def avg(values):
+            return sum(values) / len(values)
+        lines = [
+            f"frames: {self.frames}",
+            f"alloc churn/frame: avg {avg(self.churn) / 1024:.1f} KiB, max {max(self.churn) / 1024:.1f} KiB",
+            f"net blocks/frame: avg {avg(self.blocks):+.1f}",
+            f"gc objects/frame: avg {avg(self.objects):.1f}, max {max(self.objects)}",
+        ]
+        if self.gc_pauses:
+            worst = max(self.gc_pauses, key=lambda p: p[1])
+            lines.append(f"gc pauses: {len(self.gc_pauses)}, total {sum(p[1] for p in self.gc_pauses):.2f} ms, "
+                         f"worst {worst[1]:.2f} ms (gen {worst[0]}, {worst[2]} collected)")
+        else:
+            lines.append("gc pauses: none")
+        for site, size in sorted(self.sites.items(), key=lambda s: -s[1])[:self.top]:
+            lines.append(f"  {size / 1024:8.1f} KiB  {site}")
+        return lines
+
+
+# ---------------- GC POLICY ----------------
+class GCPolicy:
+    """Keeps collector pauses out of gameplay.
+
+    startup_done() collects once and freezes everything alive (assets, fonts,
+    caches) into the permanent generation so later collections skip it.
+    During a run automatic collection is off; refcounting still frees almost
+    everything, and if tracked objects pile up past `limit` a cheap gen0 pass
+    runs. end_play() collects fully at the next screen transition (game over,
+    menu) where a pause can't be seen, and turns the collector back on.
+    """
+
+    def __init__(self, limit=50_000):
+        self.limit = limit
+        self.deferred = 0       # gen0 passes forced during play
+
+    def startup_done(self):
+        gc.collect()
+        gc.freeze()
+
+    def begin_play(self):
+        gc.disable()
+
+    def frame(self):
+        if gc.get_count()[0] > self.limit:
+            gc.collect(0)
+            self.deferred += 1
+
+    def end_play(self):
+        gc.collect()
+        gc.enable()
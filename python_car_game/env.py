@@ -0,0 +1,193 @@
+import os
+
+# Environments never open a real window; only set a driver if the caller didn't choose one
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import Game
+from renderer import SoftwareRenderer
+from replay import KEY_STATES
+
+# Discrete actions -> WASD bitmask (W=1, A=2, S=4, D=8, as in replay.KEY_BITS)
+ACTIONS = [
+    0,          # 0 coast
+    1,          # 1 W  forward
+    4,          # 2 S  back
+    2,          # 3 A  left
+    8,          # 4 D  right
+    1 | 2,      # 5 W+A
+    1 | 8,      # 6 W+D
+    4 | 2,      # 7 S+A
+    4 | 8,      # 8 S+D
+]
+
+# Occupancy grid over the visible road, one channel for cars and one for boss bullets
+GRID_ROWS, GRID_COLS = 8, 6
+CELL_H = Game.SCREEN_HEIGHT // GRID_ROWS
+CELL_W = Game.SCREEN_WIDTH // GRID_COLS
+NEAREST_COINS = 4
+
+# Observation layout (float32):
+#   [0:2]   player centre x, y (0..1 of the screen)
+#   cars    GRID_ROWS * GRID_COLS 0/1 cells covered by a car hitbox
+#   bullets GRID_ROWS * GRID_COLS 0/1 cells holding a boss bullet
+#   coins   NEAREST_COINS * (dx, dy) to the nearest visible coins, screen-normalised, 0 if none
+#   boss    boss mode, vulnerable, hp fraction, dx, dy
+GRID_SIZE = GRID_ROWS * GRID_COLS
+_CARS    = slice(2, 2 + GRID_SIZE)
+_BULLETS = slice(_CARS.stop, _CARS.stop + GRID_SIZE)
+_COINS   = slice(_BULLETS.stop, _BULLETS.stop + NEAREST_COINS * 2)
+_BOSS    = slice(_COINS.stop, _COINS.stop + 5)
+OBS_SIZE = _BOSS.stop
+
+# Reward: score gained (distance + bonus) plus a point per coin, DEATH_PENALTY on a crash
+COIN_REWARD   = 1.0
+DEATH_PENALTY = -10.0
+
+
+def observe(world, out):
+    """Write `world`'s observation into the float32 array `out` (length OBS_SIZE)."""
+    out.fill(0)
+    W, H = Game.SCREEN_WIDTH, Game.SCREEN_HEIGHT
+    P1 = world.player
+    px, py = P1.rect.center
+    out[0] = px / W
+    out[1] = py / H
+
+    cars = out[_CARS].reshape(GRID_ROWS, GRID_COLS)
+    for enemy in world.enemies:
+        box = enemy.hitbox
+        if box.top >= H or box.right <= 0 or box.left >= W:
+            continue
+        c0, c1 = max(box.left, 0) // CELL_W, min(box.right - 1, W - 1) // CELL_W
+        r0, r1 = box.top // CELL_H, min(box.bottom - 1, H - 1) // CELL_H
+        cars[r0:r1 + 1, c0:c1 + 1] = 1
+
+    bullets = world.bullets
+    if world.boss_mode and len(bullets):
+        n = bullets.count
+        x = bullets.x[:n]
+        y = (bullets.y[:n] - world.camera_y) % Game.BG_HEIGHT
+        inside = (x >= 0) & (x < W) & (y < H)
+        grid = out[_BULLETS].reshape(GRID_ROWS, GRID_COLS)
+        grid[(y[inside] // CELL_H).astype(int), (x[inside] // CELL_W).astype(int)] = 1
+
+    visible = [(o.rect.centerx - px, o.rect.centery - py) for o in world.objects if o.rect.top < H]
+    if visible:
+        visible.sort(key=lambda d: d[0] * d[0] + d[1] * d[1])
+        coins = out[_COINS]
+        for i, (dx, dy) in enumerate(visible[:NEAREST_COINS]):
+            coins[2 * i] = dx / W
+            coins[2 * i + 1] = dy / H
+
+    if world.boss_mode:
+        for bos in world.boss:
+            boss = out[_BOSS]
+            boss[0] = 1
+            boss[1] = bos.is_vulnerable
+            boss[2] = bos.hp / bos.max_hp
+            boss[3] = (bos.rect.centerx - px) / W
+            boss[4] = (bos.rect.centery - py) / H
+    return out
+
+
+# ---------------- ENVIRONMENTS ----------------
+class RoadEnv:
+    """reset()/step() interface over one headless World.
+
+    Actions are indexes into ACTIONS (the WASD combinations Player.move
+    understands); observations are float32 arrays of OBS_SIZE (see the layout
+    above). Nothing is drawn unless render() is called. A fixed seed makes an
+    episode repeatable.
+    """
+
+    n_actions = len(ACTIONS)
+    obs_size  = OBS_SIZE
+
+    def __init__(self, skin=None, max_steps=None):
+        Game.init(window=False)
+        self.skin = skin
+        self.max_steps = max_steps
+        self.world = None
+        self.steps = 0
+        self._obs  = np.zeros(OBS_SIZE, dtype=np.float32)
+        self._renderer = None
+
+    def reset(self, seed=None, out=None):
+        self.world = Game.World(skin=self.skin, seed=seed)
+        self.steps = 0
+        return observe(self.world, self._obs if out is None else out)
+
+    def step(self, action, out=None):
+        """Returns (observation, reward, done, info)."""
+        world = self.world
+        score, coins = world.score, world.coins
+        dead = world.step(KEY_STATES[ACTIONS[action]])
+        self.steps += 1
+
+        reward = (world.score - score) + COIN_REWARD * (world.coins - coins)
+        if dead:
+            reward += DEATH_PENALTY
+        done = bool(dead) or (self.max_steps is not None and self.steps >= self.max_steps)
+        info = {"score": world.score, "coins": world.coins, "distance": world.distance,
+                "death": dead, "steps": self.steps}
+        return observe(world, self._obs if out is None else out), reward, done, info
+
+    def render(self, renderer=None):
+        """Draw the current frame with `renderer` (default: the game window if
+        init() opened one). Headless, it draws offscreen and returns that Surface."""
+        if renderer is None:
+            renderer = Game.RENDERER
+        if renderer is None:
+            if self._renderer is None:
+                size = (Game.SCREEN_WIDTH, Game.SCREEN_HEIGHT)
+                self._renderer = SoftwareRenderer(pygame.Surface(size, depth=32), scale=Game.RENDER_SCALE)
+            renderer = self._renderer
+        Game.draw_world(self.world, renderer)
+        Game.draw_hud(self.world, renderer)
+        renderer.present()
+        if renderer is self._renderer:
+            return renderer.window
+
+
+class VecEnv:
+    """N RoadEnvs stepped in lockstep with batched observations.
+
+    Observations are written straight into one (N, OBS_SIZE) array. An
+    environment whose episode ends is reset at once (its next seed is drawn
+    from `seed`); that step returns the new episode's first observation,
+    with the final one in info["terminal_observation"].
+    """
+
+    def __init__(self, n, seed=None, **env_kwargs):
+        self.envs = [RoadEnv(**env_kwargs) for _ in range(n)]
+        self.rng  = np.random.default_rng(seed)
+        self.obs  = np.zeros((n, OBS_SIZE), dtype=np.float32)
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.dones   = np.zeros(n, dtype=bool)
+
+    def __len__(self):
+        return len(self.envs)
+
+    def _seed(self):
+        return int(self.rng.integers(2 ** 32))
+
+    def reset(self):
+        for i, env in enumerate(self.envs):
+            env.reset(self._seed(), out=self.obs[i])
+        return self.obs
+
+    def step(self, actions):
+        """Step every env with its action; returns (obs, rewards, dones, infos)."""
+        infos = []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            _, reward, done, info = env.step(int(action), out=self.obs[i])
+            if done:
+                info["terminal_observation"] = self.obs[i].copy()
+                env.reset(self._seed(), out=self.obs[i])
+            self.rewards[i] = reward
+            self.dones[i]   = done
+            infos.append(info)
+        return self.obs, self.rewards, self.dones, infos
@@ -0,0 +1,142 @@
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+
+# Exports run offscreen; only set a driver if the caller didn't choose one
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import Game
+from database import get_replay, get_top_replays
+from governor import QualityGovernor
+from renderer import SoftwareRenderer
+from replay import Recording
+
+
+# ---------------- ENCODERS ----------------
+def _png_worker(jobs, free, out_dir):
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        frame, renderer = job
+        pygame.image.save(renderer.window, os.path.join(out_dir, f"frame_{frame:06d}.png"))
+        free.put(renderer)
+
+
+def _raw_worker(jobs, free, stream):
+    # frames arrive in order from a single producer, so one writer keeps them in order
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        frame, renderer = job
+        stream.write(renderer.window.get_view("1"))   # buffer protocol, no copy
+        free.put(renderer)
+
+
+# ---------------- EXPORT ----------------
+def simulate(recording):
+    """Re-simulate `recording`, yielding (frame, world) after every recorded step."""
+    Game.init(window=False)
+    governor = QualityGovernor(1000 / Game.FPS)
+    governor.level = recording.start_level
+    world = Game.World(skin=recording.skin, seed=recording.seed, governor=governor)
+    for frame, keys, level in recording.frames():
+        governor.level = level
+        world.step(keys)
+        yield frame, world
+
+
+def export(recording, out, fmt="png", workers=4, pool_size=8):
+    """Re-simulate `recording` offscreen and encode every frame.
+
+    Frames are drawn into a fixed pool of `pool_size` surfaces; a surface
+    goes back to the pool once its frame is encoded, so the bounded job
+    queue also bounds memory. Rendering on this thread overlaps encoding on
+    the workers (PNG: `workers` threads writing frame_NNNNNN.png into the
+    `out` directory; raw: one thread streaming 32-bit frames to the `out`
+    file, e.g. for `ffmpeg -f rawvideo -pix_fmt bgra -s 600x400 -r 60 -i out`).
+    Returns (frames, seconds).
+    """
+    Game.init(window=False)
+    size = (Game.SCREEN_WIDTH, Game.SCREEN_HEIGHT)
+    free = queue.Queue()
+    for _ in range(pool_size):
+        free.put(SoftwareRenderer(pygame.Surface(size, depth=32), scale=Game.RENDER_SCALE))
+    jobs = queue.Queue(maxsize=pool_size)
+
+    stream = None
+    if fmt == "raw":
+        stream = open(out, "wb")
+        threads = [threading.Thread(target=_raw_worker, args=(jobs, free, stream))]
+    else:
+        os.makedirs(out, exist_ok=True)
+        threads = [threading.Thread(target=_png_worker, args=(jobs, free, out))
+                   for _ in range(workers)]
+    for t in threads:
+        t.start()
+
+    start = time.perf_counter()
+    frame, world = 0, None
+    try:
+        for frame, world in simulate(recording):
+            renderer = free.get()
+            Game.draw_world(world, renderer)
+            Game.draw_hud(world, renderer)
+            renderer.present()
+            jobs.put((frame, renderer))
+        # let the crash effect play out like it does on screen
+        for frame in range(frame + 1, frame + 1 + Game.CRASH_FRAMES):
+            world.particles.update()
+            renderer = free.get()
+            Game.draw_world(world, renderer)
+            renderer.present()
+            jobs.put((frame, renderer))
+    finally:
+        for _ in threads:
+            jobs.put(None)
+        for t in threads:
+            t.join()
+        if stream is not None:
+            stream.close()
+    return frame + 1, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a recorded run as a PNG sequence or raw frames.")
+    which = parser.add_mutually_exclusive_group()
+    which.add_argument("--replay", type=int, help="replay id (default: best stored run)")
+    which.add_argument("--list", action="store_true", help="list the best stored runs")
+    parser.add_argument("--out", default="export", help="output directory (png) or file (raw)")
+    parser.add_argument("--format", choices=("png", "raw"), default="png")
+    parser.add_argument("--workers", type=int, default=4, help="PNG encoder threads")
+    args = parser.parse_args()
+
+    if args.list:
+        for replay_id, username, score in get_top_replays(20):
+            print(f"{replay_id:5d}  {score:6d}  {username}")
+        return
+
+    replay_id = args.replay
+    if replay_id is None:
+        top = get_top_replays(1)
+        if not top:
+            sys.exit("no recorded runs")
+        replay_id = top[0][0]
+    stored = get_replay(replay_id)
+    if stored is None:
+        sys.exit(f"no replay {replay_id}")
+
+    seed, skin, levels, inputs = stored
+    frames, seconds = export(Recording(seed, skin, levels, inputs), args.out, args.format, args.workers)
+    print(f"{frames} frames in {seconds:.2f}s ({frames / seconds:.0f} fps, "
+          f"{frames / Game.FPS / seconds:.1f}x real time) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from collections import deque
+
+# Quality levels, best first. Each level sheds one more piece of optional work:
+#   overlays     - DEBUG_HITBOX-style debug rectangles
+#   anim_div     - animations advance 1/anim_div as often
+#   flash        - boss vulnerability flash
+#   coin_density - multiplier on random coin spawns
+#   background   - textured road (False = flat road colour)
+#   particles    - multiplier on particles per effect burst
+LEVELS = [
+    {"overlays": True,  "anim_div": 1, "flash": True,  "coin_density": 1.0, "background": True,  "particles": 1.0},
+    {"overlays": False, "anim_div": 1, "flash": True,  "coin_density": 1.0, "background": True,  "particles": 1.0},
+    {"overlays": False, "anim_div": 2, "flash": True,  "coin_density": 1.0, "background": True,  "particles": 1.0},
+    {"overlays": False, "anim_div": 2, "flash": False, "coin_density": 1.0, "background": True,  "particles": 1.0},
+    {"overlays": False, "anim_div": 3, "flash": False, "coin_density": 0.5, "background": True,  "particles": 0.5},
+    {"overlays": False, "anim_div": 3, "flash": False, "coin_density": 0.5, "background": False, "particles": 0.5},
+]
+
+
+class QualityGovernor:
+    """Steps optional work down/up to keep frame times inside the FPS budget.
+
+    Feed it the time spent working each frame (not the time spent sleeping in
+    Clock.tick). When the recent 90th percentile goes over `down_at` of the
+    budget it drops a level; after a full window under `up_at` it climbs back.
+    Changes are at least `cooldown` frames apart so it doesn't oscillate.
+    """
+
+    def __init__(self, budget_ms, window=60, down_at=0.9, up_at=0.6, cooldown=90):
+        self.budget_ms = budget_ms
+        self.down_at   = down_at
+        self.up_at     = up_at
+        self.cooldown  = cooldown
+
+        self.samples = deque(maxlen=window)
+        self.level   = 0
+        self.changes = 0
+        self._since_change = 0
+
+    @property
+    def settings(self):
+        return LEVELS[self.level]
+
+    def _p90(self):
+        ordered = sorted(self.samples)
+        return ordered[int(len(ordered) * 0.9) - 1]
+
+    def record(self, frame_ms):
+        self.samples.append(frame_ms)
+        self._since_change += 1
+        if self._since_change < self.cooldown or len(self.samples) < self.samples.maxlen:
+            return
+
+        p90 = self._p90()
+        if p90 > self.budget_ms * self.down_at and self.level < len(LEVELS) - 1:
+            self._set_level(self.level + 1)
+        elif p90 < self.budget_ms * self.up_at and self.level > 0:
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self.changes += 1
+        self._since_change = 0
+        self.samples.clear()
+
+    def stats(self):
+        """Current level and recent frame times, for HUD/log instrumentation."""
+        if not self.samples:
+            return {"level": self.level, "avg_ms": 0.0, "p90_ms": 0.0,
+                    "budget_ms": self.budget_ms, "changes": self.changes}
+        return {
+            "level":     self.level,
+            "avg_ms":    sum(self.samples) / len(self.samples),
+            "p90_ms":    self._p90(),
+            "budget_ms": self.budget_ms,
+            "changes":   self.changes,
+        }
@@ -0,0 +1,132 @@
+import time
+from collections import deque
+import pygame
+
+# Keys whose presses/releases are traced
+TRACED_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+# ---------------- LATENCY TRACING ----------------
+class LatencyTracer:
+    """Follows WASD key events from arrival to the flip that shows their result.
+
+    pygame doesn't expose SDL's event timestamps, so "arrival" is when the
+    event is pulled off the queue; the event may have been waiting since the
+    previous poll, which is recorded separately as `queue` (an upper bound).
+    Each traced event gets three intervals:
+        queue  - previous poll -> this poll (worst-case wait in the queue)
+        input  - poll -> end of the World.step that consumed it
+        render - end of that step -> display flip
+    """
+
+    def __init__(self, window=2000):
+        self.queue  = deque(maxlen=window)
+        self.input  = deque(maxlen=window)
+        self.render = deque(maxlen=window)
+        self.total  = deque(maxlen=window)    # queue + input + render
+
+        self._last_poll = None
+        self._arrived   = []       # poll times of events waiting for a step
+        self._stepped   = []       # (poll time, queue wait, step time) waiting for a flip
+        self._wait      = 0.0
+
+    def polled(self, events):
+        now = time.perf_counter()
+        wait = now - self._last_poll if self._last_poll is not None else 0.0
+        self._last_poll = now
+        for event in events:
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in TRACED_KEYS:
+                self._arrived.append(now)
+                self._wait = wait
+
+    def stepped(self):
+        if self._arrived:
+            now = time.perf_counter()
+            self._stepped.extend((t, self._wait, now) for t in self._arrived)
+            self._arrived.clear()
+
+    def presented(self):
+        if self._stepped:
+            now = time.perf_counter()
+            for polled, wait, stepped in self._stepped:
+                self.queue.append(wait * 1000)
+                self.input.append((stepped - polled) * 1000)
+                self.render.append((now - stepped) * 1000)
+                self.total.append((wait + now - polled) * 1000)
+            self._stepped.clear()
+
+    def stats(self):
+        """{name: (p50, p90, p99)} in ms for every interval, or {} before any key event."""
+        if not self.total:
+            return {}
+        result = {}
+        for name in ("queue", "input", "render", "total"):
+            ordered = sorted(getattr(self, name))
+            result[name] = tuple(_percentile(ordered, q) for q in (0.5, 0.9, 0.99))
+        return result
+
+    def report(self):
+        stats = self.stats()
+        if not stats:
+            return ["latency: no key events traced"]
+        lines = [f"latency over {len(self.total)} key events (ms, p50 / p90 / p99):"]
+        for name, (p50, p90, p99) in stats.items():
+            lines.append(f"  {name:6s} {p50:6.2f} / {p90:6.2f} / {p99:6.2f}")
+        return lines
+
+
+# ---------------- FRAME PACING ----------------
+class FramePacer:
+    """Low-latency frame pacing: wait first, then read input, simulate and present.
+
+    Instead of sleeping in Clock.tick after presenting (so input waits out
+    the sleep before it is read), the wait comes first and ends just early
+    enough for the frame's work to finish on its deadline; input is sampled
+    right after it. The wait sleeps most of the way and spins on
+    perf_counter for the last `spin_ms`, since sleep can overshoot by a
+    millisecond or more. Work time is tracked as a decaying maximum so one
+    fast frame doesn't make the next one late.
+    """
+
+    def __init__(self, fps, spin_ms=2.0, margin_ms=1.0):
+        self.period = 1 / fps
+        self.spin   = spin_ms / 1000
+        self.margin = margin_ms / 1000
+        self.work   = self.period / 4   # estimated seconds of work per frame
+        self.work_ms = 0.0        # last frame's actual work, for the quality governor
+        self.late   = 0           # frames that missed their deadline
+        self._start = None
+        self.reset()
+
+    def reset(self):
+        """Start pacing from now (new run, or after a screen that didn't pace)."""
+        self.deadline = time.perf_counter() + self.period
+
+    def _wait_until(self, target):
+        remaining = target - time.perf_counter()
+        if remaining > self.spin:
+            time.sleep(remaining - self.spin)
+        while time.perf_counter() < target:
+            pass
+
+    def wait_for_input(self):
+        """Block until it's time to sample input for the next frame."""
+        self._wait_until(self.deadline - self.work - self.margin)
+        self._start = time.perf_counter()
+
+    def frame_done(self):
+        """Call right after presenting."""
+        now = time.perf_counter()
+        work = now - self._start
+        self.work_ms = work * 1000
+        self.work    = max(work, self.work * 0.95)
+        if now > self.deadline:
+            self.late += 1
+        self.deadline += self.period
+        if now > self.deadline:
+            # fell a whole frame behind; re-anchor rather than rushing to catch up
+            self.deadline = now + self.period
@@ -0,0 +1,121 @@
+import math
+from functools import lru_cache
+import numpy as np
+import pygame
+
+# name: (colours, particles per burst, speed, lifetime in frames, gravity)
+EFFECTS = {
+    "crash":    ([(255, 140, 0), (255, 220, 60), (90, 90, 90)], 48, 5.0, 40, 0.15),
+    "coin":     ([(255, 215, 0), (255, 255, 180)],              14, 2.5, 20, 0.0),
+    "boss_hit": ([(255, 255, 255), (220, 40, 40)],              32, 4.0, 28, 0.0),
+}
+
+# Particle radius (logical pixels) as it ages: young, middle, old
+SIZES = (3, 2, 1)
+
+
+@lru_cache(maxsize=None)
+def particle_image(colour, radius, scale=1):
+    """Dot of `radius` centred in a box sized for the largest stage, for a 1/`scale` canvas."""
+    box = max(1, 2 * SIZES[0] // scale)
+    image = pygame.Surface((box, box), pygame.SRCALPHA)
+    pygame.draw.circle(image, colour, (box // 2, box // 2), max(1, radius // scale))
+    return image
+
+
+# ---------------- PARTICLE SYSTEM ----------------
+class ParticleSystem:
+    """Short-lived visual effects stored in fixed-size NumPy arrays.
+
+    Bursts write straight into the arrays (no object per particle) and
+    particles beyond `capacity` are simply not spawned. Integration, drag,
+    gravity and expiry are whole-array operations, and drawing turns the
+    arrays into (image, position) draw commands in one pass. Positions are
+    in world space so effects scroll with the road. Particles never feed
+    back into the simulation and use their own RNG.
+    """
+
+    def __init__(self, world_height, capacity=2048, drag=0.94, scale=1, seed=None):
+        self.world_height = world_height
+        self.capacity = capacity
+        self.drag     = drag
+        self.rng      = np.random.default_rng(seed)
+
+        # one image per (colour, stage); effects refer to colours by index
+        colours = []
+        self.effects = {}
+        for name, (palette, count, speed, life, gravity) in EFFECTS.items():
+            first = len(colours)
+            colours.extend(palette)
+            self.effects[name] = (np.arange(first, len(colours)), count, speed, life, gravity)
+        self.images = [particle_image(c, r, scale) for c in colours for r in SIZES]
+
+        self.x    = np.zeros(capacity)
+        self.y    = np.zeros(capacity)
+        self.vx   = np.zeros(capacity)
+        self.vy   = np.zeros(capacity)
+        self.g    = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.colour   = np.zeros(capacity, dtype=np.int32)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def burst(self, effect, x, y, density=1.0):
+        """Spawn one `effect` at world (x, y); `density` scales the particle count."""
+        colours, count, speed, life, gravity = self.effects[effect]
+        start = self.count
+        n = min(int(count * density), self.capacity - start)
+        if n <= 0:
+            return
+        end, rng = start + n, self.rng
+
+        angles = rng.uniform(0, 2 * math.pi, n)
+        speeds = rng.uniform(0.3, 1.0, n) * speed
+        self.x[start:end]  = x
+        self.y[start:end]  = y
+        self.vx[start:end] = np.cos(angles) * speeds
+        self.vy[start:end] = np.sin(angles) * speeds
+        self.g[start:end]  = gravity
+        self.life[start:end]     = rng.integers(life // 2, life + 1, n)
+        self.max_life[start:end] = life
+        self.colour[start:end]   = rng.choice(colours, n)
+        self.count = end
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        self.x[:n]  += self.vx[:n]
+        self.y[:n]  += self.vy[:n]
+        self.vx[:n] *= self.drag
+        self.vy[:n] *= self.drag
+        self.vy[:n] += self.g[:n]
+        self.life[:n] -= 1
+
+        alive = self.life[:n] > 0
+        if not alive.all():
+            k = int(np.count_nonzero(alive))
+            for a in (self.x, self.y, self.vx, self.vy, self.g, self.life, self.max_life, self.colour):
+                a[:k] = a[:n][alive]
+            self.count = k
+
+    def commands(self, camera_y):
+        """(image, screen position) for every live particle, for a DrawList."""
+        n = self.count
+        if not n:
+            return []
+        stages = len(SIZES)
+        age = 1 - self.life[:n] / self.max_life[:n]
+        key = self.colour[:n] * stages + np.minimum(age * stages, stages - 1).astype(np.int32)
+
+        pos = np.empty((n, 2), dtype=np.int32)
+        pos[:, 0] = self.x[:n] - SIZES[0]
+        pos[:, 1] = (self.y[:n] - camera_y) % self.world_height - SIZES[0]
+        images = self.images
+        return [(images[k], p) for k, p in zip(key.tolist(), pos.tolist())]
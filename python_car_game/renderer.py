@@ -0,0 +1,333 @@
+import os
+import weakref
+import pygame
+
+# Largest texture side we upload in one piece; taller images (the 9000px road)
+# are split into strips so older GPUs that cap textures at 4096/8192 still work.
+MAX_TEXTURE_SIDE = 4096
+
+
+# ---------------- HELPERS ----------------
+_image_cache = {}
+_decoded     = {}
+
+def adopt_image(path, image):
+    """Hand over a Surface decoded on a worker thread; load_image() converts it."""
+    _decoded[path] = image
+
+
+def load_image(path, alpha=True):
+    """Load an image once, converting it to the display format when there is one.
+
+    Loaded images are shared, so callers copy/flip/subsurface rather than
+    drawing onto them.
+    """
+    key = (path, alpha)
+    image = _image_cache.get(key)
+    if image is not None:
+        return image
+    image = _decoded.pop(path, None) or pygame.image.load(path)
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha() if alpha else image.convert()
+    # else: texture backend (or headless), no video mode to convert against
+    _image_cache[key] = image
+    return image
+
+
+def cut_frame(sheet, area, size, scale=1):
+    """Cut one frame out of a sprite sheet, sized for a canvas at 1/`scale`.
+
+    `size` is the frame's on-screen size in logical pixels. At scale 2 the
+    2x pixel art is kept at its native size instead of an upscaled copy.
+    """
+    frame = sheet.subsurface(area).copy()
+    target = (size[0] // scale, size[1] // scale)
+    if target != frame.get_size():
+        frame = pygame.transform.scale(frame, target)
+    return frame
+
+
+def to_canvas(image, scale=1):
+    """Downscale a full-resolution image (cars, road) once for a 1/`scale` canvas."""
+    if scale == 1:
+        return image
+    return pygame.transform.smoothscale_by(image, 1 / scale)
+
+
+_flash_cache = weakref.WeakKeyDictionary()
+
+def flash_image(image):
+    """White silhouette of `image`, built once per source frame and cached."""
+    flashed = _flash_cache.get(image)
+    if flashed is None:
+        flashed = image.copy()
+        flashed.fill((255, 255, 255, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        _flash_cache[image] = flashed
+    return flashed
+
+
+def fit_rect(size, window_size):
+    """Largest rect of `size`'s aspect ratio centred in the window (letterboxed)."""
+    w, h = size
+    win_w, win_h = window_size
+    factor = min(win_w / w, win_h / h)
+    rect = pygame.Rect(0, 0, int(w * factor), int(h * factor))
+    rect.center = (win_w // 2, win_h // 2)
+    return rect
+
+
+# ---------------- DRAW LIST ----------------
+class DrawList:
+    """One frame's sprite draws as (image, position) pairs, bucketed by layer.
+
+    Layers come out in index order and each layer in the order it was
+    filled, so gathering needs no sort. `fill` clears the canvas first and
+    debug `rects` go on top. Renderers draw a whole list with submit().
+    """
+
+    def __init__(self, layers):
+        self.layers = [[] for _ in range(layers)]
+        self.rects  = []
+        self.fill   = None
+
+    def add(self, layer, image, pos):
+        self.layers[layer].append((image, pos))
+
+    def extend(self, layer, commands):
+        self.layers[layer].extend(commands)
+
+    def rect(self, color, rect, width=0):
+        self.rects.append((color, rect, width))
+
+    def clear(self):
+        for layer in self.layers:
+            layer.clear()
+        self.rects.clear()
+        self.fill = None
+
+    def commands(self):
+        return [command for layer in self.layers for command in layer]
+
+
+# ---------------- SOFTWARE BACKEND ----------------
+class SoftwareRenderer:
+    """Blits onto Surfaces, presenting to the display surface when it owns it.
+
+    Gameplay sprites go to `world`, a canvas at the internal resolution
+    (logical size / scale). UI screens draw on `screen` at the logical size.
+    When either differs from the window it is scaled onto it once in
+    present()/present_screen(). Overlays (the HUD) are drawn after that
+    scale at window resolution so text stays sharp.
+    """
+
+    name = "software"
+
+    def __init__(self, window=None, logical_size=None, scale=1, smooth=False):
+        self.window = window if window is not None else pygame.display.get_surface()
+        self.logical_size = logical_size or self.window.get_size()
+        self.scale  = scale
+        self.smooth = smooth
+
+        win_size = self.window.get_size()
+        self.view = fit_rect(self.logical_size, win_size)
+        internal  = (self.logical_size[0] // scale, self.logical_size[1] // scale)
+
+        self.screen = self.window if self.logical_size == win_size else pygame.Surface(self.logical_size)
+        self.world  = self.window if internal == win_size else pygame.Surface(internal)
+        self._overlays = []
+
+    def submit(self, draw_list):
+        """Draw a DrawList: the fill, every sprite in one Surface.blits call, then its rects."""
+        if draw_list.fill is not None:
+            self.world.fill(draw_list.fill)
+        commands = draw_list.commands()
+        s = self.scale
+        if s != 1:
+            commands = [(image, (pos[0] // s, pos[1] // s)) for image, pos in commands]
+        self.world.blits(commands, doreturn=False)
+        for color, rect, width in draw_list.rects:
+            self.draw_rect(color, rect, width)
+
+    def draw_rect(self, color, rect, width=0):
+        s = self.scale
+        rect = pygame.Rect(rect)
+        pygame.draw.rect(self.world, color, (rect.x // s, rect.y // s, rect.w // s, rect.h // s), width)
+
+    def blit_overlay(self, image, pos):
+        if self.world is self.window:
+            self.world.blit(image, pos)
+        else:
+            self._overlays.append((image, pos))
+
+    def _stretch(self, canvas):
+        if canvas is self.window:
+            return
+        view = self.window.subsurface(self.view)
+        if self.smooth:
+            pygame.transform.smoothscale(canvas, self.view.size, view)
+        else:
+            pygame.transform.scale(canvas, self.view.size, view)
+
+    def present(self):
+        self._stretch(self.world)
+        if self._overlays:
+            factor = self.view.width / self.logical_size[0]
+            for image, (x, y) in self._overlays:
+                if factor != 1:
+                    image = pygame.transform.scale_by(image, factor)
+                self.window.blit(image, (self.view.x + x * factor, self.view.y + y * factor))
+            self._overlays.clear()
+        if self.window is pygame.display.get_surface():
+            pygame.display.update()
+
+    def present_screen(self):
+        self._overlays.clear()
+        self._stretch(self.screen)
+        if self.window is pygame.display.get_surface():
+            pygame.display.update()
+
+
+# ---------------- TEXTURE BACKEND ----------------
+class TextureRenderer:
+    """SDL2 Renderer/Texture backend.
+
+    submit() queues a draw list and present() sends it as one batch of
+    texture draws. Surfaces are uploaded once and the textures are
+    cached for as long as the source Surface lives. With an internal
+    resolution the batch is drawn into a target texture that is stretched to
+    the window in one draw. Screens that draw straight onto `screen` (menus,
+    shop, login) call present_screen(), which uploads it as a single
+    streaming texture.
+    """
+
+    name = "texture"
+
+    def __init__(self, window_size, title, logical_size=None, scale=1, smooth=False,
+                 fullscreen=False, accelerated=-1, vsync=False):
+        # SDL reads the scale filter hint when textures are created
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "1" if smooth else "0"
+        from pygame._sdl2 import video
+        self._video = video
+
+        self.window   = video.Window(title, size=window_size, fullscreen=fullscreen)
+        self.renderer = video.Renderer(self.window, accelerated=accelerated, vsync=vsync,
+                                       target_texture=True)
+        self.logical_size = logical_size or window_size
+        self.scale  = scale
+        self.smooth = smooth
+        self.view   = fit_rect(self.logical_size, self.window.size)
+        internal    = (self.logical_size[0] // scale, self.logical_size[1] // scale)
+
+        self.screen = pygame.Surface(self.logical_size)
+        self.world_size = internal
+        self._target = None
+        if internal != tuple(self.window.size):
+            self._target = video.Texture(self.renderer, internal, target=True)
+
+        self._screen_tex = video.Texture(self.renderer, self.logical_size, streaming=True)
+        self._textures   = weakref.WeakKeyDictionary()
+        self._overlay_tex = weakref.WeakKeyDictionary()   # HUD labels are cached Surfaces too
+        self._batch      = []
+        self._overlays   = []
+
+    def _upload(self, image):
+        # list of (texture, y offset) strips covering the image
+        w, h = image.get_size()
+        strips = []
+        for y in range(0, h, MAX_TEXTURE_SIDE):
+            part = image.subsurface((0, y, w, min(MAX_TEXTURE_SIDE, h - y)))
+            strips.append((self._video.Texture.from_surface(self.renderer, part), y))
+        return strips
+
+    def _strips(self, image):
+        strips = self._textures.get(image)
+        if strips is None:
+            strips = self._textures[image] = self._upload(image)
+        return strips
+
+    def submit(self, draw_list):
+        if draw_list.fill is not None:
+            self.draw_rect(draw_list.fill, (0, 0, *self.logical_size))
+        s, strips = self.scale, self._strips
+        self._batch.extend((strips(image), (pos[0] // s, pos[1] // s))
+                           for image, pos in draw_list.commands())
+        for color, rect, width in draw_list.rects:
+            self.draw_rect(color, rect, width)
+
+    def draw_rect(self, color, rect, width=0):
+        s = self.scale
+        rect = pygame.Rect(rect)
+        self._batch.append((color, pygame.Rect(rect.x // s, rect.y // s, rect.w // s, rect.h // s), width))
+
+    def blit_overlay(self, image, pos):
+        self._overlays.append((image, pos))
+
+    def _draw(self, strips, pos):
+        x, y = pos
+        screen_h = self.world_size[1]
+        for tex, offset in strips:
+            dy = y + offset
+            if dy >= screen_h or dy + tex.height <= 0:
+                continue
+            tex.draw(dstrect=(x, dy, tex.width, tex.height))
+
+    def present(self):
+        r = self.renderer
+        if self._target is not None:
+            r.target = self._target
+        for cmd in self._batch:
+            if len(cmd) == 2:
+                self._draw(*cmd)
+            else:
+                color, rect, width = cmd
+                r.draw_color = pygame.Color(color)
+                if width:
+                    r.draw_rect(rect)
+                else:
+                    r.fill_rect(rect)
+        self._batch.clear()
+        if self._target is not None:
+            r.target = None
+            self._target.draw(dstrect=self.view)
+
+        factor = self.view.width / self.logical_size[0]
+        for image, (x, y) in self._overlays:
+            tex = self._overlay_tex.get(image)
+            if tex is None:
+                tex = self._overlay_tex[image] = self._video.Texture.from_surface(r, image)
+            tex.draw(dstrect=(self.view.x + x * factor, self.view.y + y * factor,
+                              tex.width * factor, tex.height * factor))
+        self._overlays.clear()
+
+        r.present()
+        r.draw_color = (0, 0, 0, 255)
+        r.clear()
+
+    def present_screen(self):
+        # anything queued belongs to an abandoned gameplay frame
+        self._batch.clear()
+        self._overlays.clear()
+        self._screen_tex.update(self.screen)
+        self._screen_tex.draw(dstrect=self.view)
+        self.renderer.present()
+        self.renderer.clear()
+
+
+def create_renderer(backend, size, title, scale=1, window_size=None, fullscreen=False, smooth=False):
+    """Build the requested backend, falling back to software drawing.
+
+    `size` is the logical resolution the game is laid out in; gameplay is
+    rendered at `size // scale` and scaled once per frame to the window.
+    """
+    if backend == "texture":
+        try:
+            return TextureRenderer(window_size or size, title, logical_size=size, scale=scale,
+                                   smooth=smooth, fullscreen=fullscreen)
+        except (ImportError, RuntimeError) as e:
+            print(f"Texture renderer unavailable ({e}); using software renderer")
+    if fullscreen:
+        window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        window = pygame.display.set_mode(window_size or size)
+    pygame.display.set_caption(title)
+    return SoftwareRenderer(window, logical_size=size, scale=scale, smooth=smooth)
@@ -0,0 +1,74 @@
+from pygame.locals import K_w, K_a, K_s, K_d
+
+# Bit per control key in a recorded input byte
+KEY_BITS = ((K_w, 1), (K_a, 2), (K_s, 4), (K_d, 8))
+
+
+def encode_keys(pressed):
+    """Pack the WASD state of a key snapshot into one byte."""
+    mask = 0
+    for key, bit in KEY_BITS:
+        if pressed[key]:
+            mask |= bit
+    return mask
+
+
+class KeyState:
+    """Stands in for pygame.key.get_pressed() when replaying a recorded byte."""
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        for k, bit in KEY_BITS:
+            if k == key:
+                return bool(self.mask & bit)
+        return False
+
+
+# Pre-built states for every byte, so replaying allocates nothing per frame
+KEY_STATES = [KeyState(mask) for mask in range(16)]
+
+
+class Recording:
+    """A run as its World seed, skin, and one WASD byte per simulated frame.
+
+    World.step() is deterministic given those, except for the quality
+    governor, whose coin density and animation rate feed back into the
+    simulation; its level changes are recorded as (frame, level) pairs.
+    `level` is the governor's level when the World was built (it picks the
+    first coin's delay) and is kept as a change at frame 0.
+    """
+
+    def __init__(self, seed, skin, levels=None, inputs=None, level=0):
+        self.seed   = seed
+        self.skin   = skin
+        self.levels = list(levels or [])
+        if not self.levels and level:
+            self.levels.append((0, level))
+        self.inputs = bytearray(inputs or b"")
+        self._level = self.levels[-1][1] if self.levels else 0
+
+    @property
+    def start_level(self):
+        """Governor level to build the replay's World at."""
+        return dict(self.levels).get(0, 0)
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def add(self, pressed, level=0):
+        if level != self._level:
+            self.levels.append((len(self.inputs), level))
+            self._level = level
+        self.inputs.append(encode_keys(pressed))
+
+    def frames(self):
+        """(frame, key state, quality level) for every recorded frame."""
+        changes = dict(self.levels)
+        level = 0
+        for frame, mask in enumerate(self.inputs):
+            level = changes.get(frame, level)
+            yield frame, KEY_STATES[mask], level
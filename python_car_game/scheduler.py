@@ -0,0 +1,115 @@
+import heapq
+import itertools
+
+
+class Timer:
+    """Handle for a scheduled callback. cancel() it or read how long is left."""
+
+    __slots__ = ("when", "interval", "callback", "args", "cancelled", "_scheduler")
+
+    def __init__(self, scheduler, when, interval, callback, args):
+        self._scheduler = scheduler
+        self.when       = when
+        self.interval   = interval      # None for one-shot timers
+        self.callback   = callback
+        self.args       = args
+        self.cancelled  = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def active(self):
+        return not self.cancelled and (self.interval is not None or self.when > self._scheduler.now)
+
+    @property
+    def remaining(self):
+        """Seconds until the next fire (0 if cancelled or due)."""
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.when - self._scheduler.now)
+
+
+class Scheduler:
+    """Timed and periodic callbacks on a priority queue, driven by elapsed seconds.
+
+    Only timers that are due are touched, so a thousand idle timers cost
+    nothing per frame. advance(dt) fires everything due within dt in time
+    order; a periodic timer that fell behind (long frame) fires once per
+    missed interval, so timings add up the same at any frame rate.
+    Cancelled timers are dropped lazily when they reach the front.
+
+    While dt stays the same, `now` is base + ticks * dt rather than a
+    running sum, so a fixed step never accumulates rounding. Timers
+    scheduled from inside a callback count from that timer's deadline,
+    not from `now`, so chains of one-shots (animations, boss phases) don't
+    drift by the part of a frame each one fired late.
+    """
+
+    def __init__(self):
+        self.now   = 0.0
+        self._heap = []
+        self._seq  = itertools.count()   # keeps equal deadlines in schedule order
+        self._base, self._dt, self._ticks = 0.0, None, 0
+        self._firing = None     # deadline of the timer whose callback is running
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _push(self, timer):
+        heapq.heappush(self._heap, (timer.when, next(self._seq), timer))
+        return timer
+
+    def _start(self):
+        return self.now if self._firing is None else self._firing
+
+    def call_later(self, delay, callback, *args):
+        """Run callback(*args) once, `delay` seconds from now."""
+        return self._push(Timer(self, self._start() + delay, None, callback, args))
+
+    def call_every(self, interval, callback, *args, delay=None):
+        """Run callback(*args) every `interval` seconds, first after `delay` (default interval)."""
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        first = interval if delay is None else delay
+        return self._push(Timer(self, self._start() + first, interval, callback, args))
+
+    def call_at(self, when, callback, *args, interval=None):
+        """Schedule callback(*args) at absolute time `when` (e.g. restoring a saved timer)."""
+        return self._push(Timer(self, when, interval, callback, args))
+
+    def pending(self):
+        """Live timers in the order they will fire."""
+        return [timer for _, _, timer in sorted(self._heap) if not timer.cancelled]
+
+    def get_time(self):
+        """(base, dt, ticks) that `now` is derived from, for snapshots."""
+        return self._base, self._dt, self._ticks
+
+    def set_time(self, base, dt, ticks):
+        self._base, self._dt, self._ticks = base, dt, ticks
+        self.now = base if dt is None else base + ticks * dt
+
+    def advance(self, dt):
+        if dt != self._dt:
+            self._base, self._dt, self._ticks = self.now, dt, 0
+        self._ticks += 1
+        self.now = self._base + self._ticks * dt
+        heap = self._heap
+        try:
+            while heap and heap[0][0] <= self.now:
+                timer = heapq.heappop(heap)[2]
+                if timer.cancelled:
+                    continue
+                self._firing = timer.when
+                if timer.interval is not None:
+                    timer.when += timer.interval
+                    self._push(timer)
+                timer.callback(*timer.args)
+        finally:
+            self._firing = None
+
+    def clear(self):
+        for _, _, timer in self._heap:
+            timer.cancelled = True
+        self._heap.clear()
@@ -0,0 +1,149 @@
+import json
+import os
+import numpy as np
+
+# Scalar slots, in buffer order, with the type each is restored as.
+# Ints and bools are stored exactly in float64.
+WORLD_FIELDS = (
+    ("camera_y", int), ("last_camera_y", int), ("boss_mode", bool), ("boss_defeated", bool),
+    ("frame", int), ("coins", int), ("distance", int), ("dist_score", int),
+    ("bonus_score", int), ("score", int),
+)
+BOSS_FIELDS = (
+    ("world_x", int), ("world_y", int), ("speed_x", int), ("speed_y", int),
+    ("spiral_angle", float), ("hp", int), ("is_vulnerable", bool),
+    ("took_hit_this_phase", bool), ("flash_on", bool), ("current_frame", int),
+)
+FRAME = [name for name, _ in WORLD_FIELDS].index("frame")
+
+# Per-entity rows
+ENEMY_COLUMNS  = ("type", "left", "world_x", "world_y", "speed")
+COIN_COLUMNS   = ("world_x", "world_y", "current_frame")
+PLAYER_COLUMNS = ("x", "y", "direction", "current_frame")
+TIMER_COLUMNS  = ("callback", "owner", "when", "interval")   # interval 0 = one-shot
+
+# Capacities; the road has 75 car lanes and never more than ~11 coins
+MAX_ENEMIES = 128
+MAX_COINS   = 32
+MAX_TIMERS  = 64
+MAX_BULLETS = 4096
+
+MT_WORDS = 625      # random.Random state: 624 Mersenne Twister words + position
+
+
+# ---------------- SNAPSHOT ----------------
+class Snapshot:
+    """One World's complete simulation state in preallocated NumPy buffers.
+
+    World.save_state() fills it and World.load_state() puts a world back
+    into it; neither allocates more than a few small tuples, so a snapshot
+    costs a small fraction of a frame. Rows past the n_* counts are stale.
+    Particles are cosmetic and not saved; the quality governor and telemetry
+    belong to the caller.
+    """
+
+    def __init__(self):
+        self.world   = np.zeros(len(WORLD_FIELDS))
+        self.boss    = np.zeros(len(BOSS_FIELDS))
+        self.player  = np.zeros(len(PLAYER_COLUMNS))
+        self.enemies = np.zeros((MAX_ENEMIES, len(ENEMY_COLUMNS)))
+        self.coins   = np.zeros((MAX_COINS, len(COIN_COLUMNS)))
+        self.timers  = np.zeros((MAX_TIMERS, len(TIMER_COLUMNS)))
+        self.bullets = np.zeros((4, MAX_BULLETS))      # x, y, vx, vy
+        self.rng     = np.zeros(MT_WORDS, dtype=np.uint32)
+        self.gauss   = None     # random.Random's cached gaussian
+        self.clock   = (0.0, None, 0)   # Scheduler.get_time()
+        self.boss_alive = False
+        self.n_enemies  = 0
+        self.n_coins    = 0
+        self.n_timers   = 0
+        self.n_bullets  = 0
+        self.bullets_dropped = 0
+        self.skin = None
+        self.dead = None
+        self.meta = {}          # caller data saved with a checkpoint (e.g. player id)
+
+    @property
+    def frame(self):
+        return int(self.world[FRAME])
+
+    # ---- checkpoint files ----
+    def save(self, path, **meta):
+        """Write the snapshot to `path` (replaced atomically, so a crash mid-write keeps the old one)."""
+        self.meta = meta
+        header = {
+            "skin": self.skin, "dead": self.dead, "gauss": self.gauss, "clock": self.clock,
+            "boss_alive": self.boss_alive, "bullets_dropped": self.bullets_dropped, "meta": meta,
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, header=np.array(json.dumps(header)), world=self.world, boss=self.boss,
+                     player=self.player, rng=self.rng,
+                     enemies=self.enemies[:self.n_enemies], coins=self.coins[:self.n_coins],
+                     timers=self.timers[:self.n_timers], bullets=self.bullets[:, :self.n_bullets])
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        snap = cls()
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data["header"]))
+            for name in ("world", "boss", "player", "rng"):
+                getattr(snap, name)[:] = data[name]
+            for name in ("enemies", "coins", "timers"):
+                rows = data[name]
+                getattr(snap, name)[:len(rows)] = rows
+                setattr(snap, "n_" + name, len(rows))
+            bullets = data["bullets"]
+            snap.bullets[:, :bullets.shape[1]] = bullets
+            snap.n_bullets = bullets.shape[1]
+        for name in ("skin", "dead", "gauss", "clock", "boss_alive", "bullets_dropped", "meta"):
+            setattr(snap, name, header[name])
+        return snap
+
+
+# ---------------- REWIND ----------------
+class RewindBuffer:
+    """Ring of `capacity` snapshots taken every `every` frames.
+
+    All snapshots are allocated up front and the oldest is overwritten, so
+    recording allocates nothing. rewind() restores a recent snapshot and
+    forgets the ones after it (they are the abandoned future).
+    """
+
+    def __init__(self, capacity=20, every=30):
+        self.snaps = [Snapshot() for _ in range(capacity)]
+        self.every = every
+        self.head  = 0      # slot the next snapshot goes in
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def record(self, world):
+        """Call after every step; snapshots the world every `every` frames."""
+        if world.frame % self.every == 0:
+            world.save_state(self.snaps[self.head])
+            self.head  = (self.head + 1) % len(self.snaps)
+            self.count = min(self.count + 1, len(self.snaps))
+
+    def rewind(self, world, frames):
+        """Restore the newest snapshot at least `frames` frames old (else the oldest).
+
+        Returns the snapshot restored, or None if there is none yet.
+        """
+        if not self.count:
+            return None
+        target = world.frame - frames
+        back = 1
+        while back < self.count and self.snaps[(self.head - back) % len(self.snaps)].frame > target:
+            back += 1
+        snap = self.snaps[(self.head - back) % len(self.snaps)]
+        world.load_state(snap)
+        # the restored snapshot stays the newest one
+        self.head   = (self.head - back + 1) % len(self.snaps)
+        self.count -= back - 1
+        return snap
@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Time spent in each startup phase, plus milestones like the first frame.
+
+    Phases are durations (imports, window, fonts...); marks are times since
+    `start` (first frame, warm-up done). report() lists both so
+    time-to-first-frame can be tracked from build to build.
+    """
+
+    def __init__(self, start=None):
+        self.start  = start if start is not None else time.perf_counter()
+        self.phases = []        # (name, ms)
+        self.marks  = {}        # name -> ms since start
+
+    def add(self, name, ms):
+        self.phases.append((name, ms))
+
+    @contextmanager
+    def phase(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - begin) * 1000)
+
+    def mark(self, name):
+        """Record the first time `name` happens (later calls are ignored)."""
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.start) * 1000
+
+    def report(self):
+        lines = ["startup (ms):"]
+        lines += [f"  {name:14s} {ms:8.1f}" for name, ms in self.phases]
+        lines += [f"  {name:14s} {ms:8.1f} after start" for name, ms in self.marks.items()]
+        return lines
+
+
+class Preloader:
+    """Runs startup work on worker threads while an idle screen is showing.
+
+    Each task is split in two: `work()` runs on a worker (file decoding, DB
+    reads) and `finish(result)` runs later on the main thread from poll() or
+    wait() (anything that needs the display, e.g. converting surfaces).
+    Results are kept by name and handed over through the task's future.
+    """
+
+    def __init__(self, workers=3):
+        self.pool     = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup")
+        self.futures  = {}
+        self.results  = {}
+        self._pending = []
+
+    def add(self, name, work, finish=None):
+        future = self.pool.submit(work)
+        self.futures[name] = future
+        self._pending.append((name, future, finish))
+        return future
+
+    def _finish(self, name, future, finish):
+        value = future.result()
+        self.results[name] = finish(value) if finish else value
+
+    def poll(self, budget_ms=8):
+        """Finish completed tasks on the main thread, for at most `budget_ms`."""
+        start = time.perf_counter()
+        still = []
+        for i, (name, future, finish) in enumerate(self._pending):
+            if (time.perf_counter() - start) * 1000 > budget_ms:
+                still.extend(self._pending[i:])
+                break
+            if future.done():
+                self._finish(name, future, finish)
+            else:
+                still.append((name, future, finish))
+        self._pending = still
+
+    def wait(self):
+        """Block until every task has finished (e.g. the player pressed ENTER early)."""
+        for name, future, finish in self._pending:
+            self._finish(name, future, finish)
+        self._pending = []
+        self.pool.shutdown(wait=False)
+
+    @property
+    def progress(self):
+        """(finished, total) task counts."""
+        return len(self.results), len(self.futures)
+
+    @property
+    def done(self):
+        return not self._pending
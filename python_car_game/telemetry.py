@@ -0,0 +1,81 @@
+import atexit
+import threading
+import uuid
+from collections import deque
+
+from database import save_events
+
+
+class EventLog:
+    """Gameplay event emitter backed by a ring buffer.
+
+    emit() only appends a tuple to a bounded deque, so the game loop never
+    waits on SQLite. A daemon thread drains the buffer and writes it with
+    save_events() in large single-transaction batches, either every
+    `interval` seconds, once `batch` events are waiting, or when flush() is
+    called (end of a run). If the writer falls behind, the oldest events are
+    dropped and counted rather than blocking the game.
+    """
+
+    def __init__(self, capacity=8192, batch=1024, interval=2.0, writer=save_events):
+        self.buffer   = deque(maxlen=capacity)
+        self.batch    = batch
+        self.interval = interval
+        self.writer   = writer
+
+        self.player_id = None
+        self.run_id    = None
+        self.frame     = 0
+        self.dropped   = 0
+        self.written   = 0
+
+        self._wake    = threading.Event()
+        self._stopped = False
+        self._thread  = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def start_run(self, player_id):
+        self.player_id = player_id
+        self.run_id    = uuid.uuid4().hex
+        self.frame     = 0
+        return self.run_id
+
+    def tick(self):
+        self.frame += 1
+
+    def emit(self, kind, x=None, y=None, lane=None, detail=None):
+        buffer = self.buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append((self.player_id, self.run_id, self.frame, kind, x, y, lane, detail))
+        if len(buffer) >= self.batch:
+            self._wake.set()
+
+    def flush(self):
+        """Ask the writer thread to write everything now; does not wait."""
+        self._wake.set()
+
+    def _drain(self):
+        rows = []
+        buffer = self.buffer
+        while buffer:
+            rows.append(buffer.popleft())
+        if rows:
+            self.writer(rows)
+            self.written += len(rows)
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self._drain()
+
+    def close(self, timeout=2.0):
+        """Stop the writer thread after a final flush (registered with atexit)."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout)
+        self._drain()
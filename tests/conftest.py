@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The game is a flat directory of modules that load assets by relative path
+GAME_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python_car_game")
+sys.path.insert(0, GAME_DIR)
+os.chdir(GAME_DIR)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
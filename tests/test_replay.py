@@ -0,0 +1,32 @@
+import export
+import Game
+from governor import QualityGovernor
+from replay import KEY_STATES, Recording
+
+
+def play(seed, level, max_frames=3000):
+    """Run like play_game does, with the governor at `level` from the start."""
+    Game.init(window=False)
+    governor = QualityGovernor(1000 / Game.FPS)
+    governor.level = level
+    world = Game.World(seed=seed, governor=governor)
+    recording = Recording(seed, world.skin, level=governor.level)
+    for frame in range(max_frames):
+        keys = KEY_STATES[1 | (8 if frame % 90 < 20 else 0)]   # forward, drifting right now and then
+        recording.add(keys, governor.level)
+        if world.step(keys):
+            break
+    return world, recording
+
+
+def test_replay_matches_run_started_below_full_quality():
+    live, recording = play(seed=11, level=4)
+    assert recording.start_level == 4
+
+    for _, replayed in export.simulate(recording):
+        pass
+    assert replayed.dead == live.dead
+    assert replayed.frame == live.frame
+    assert replayed.score == live.score
+    assert replayed.coins == live.coins
+    assert replayed.rng.getstate() == live.rng.getstate()
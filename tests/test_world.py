@@ -0,0 +1,35 @@
+import Game
+from replay import KEY_STATES
+from snapshot import Snapshot
+
+
+def reach_boss(monkeypatch, seed=1):
+    """Drive forward to the boss fight with cars and bullets made harmless."""
+    Game.init(window=False)
+    hits = Game.hits
+    monkeypatch.setattr(Game, "hits", lambda a, b: isinstance(b, Game.Boss) and hits(a, b))
+    world = Game.World(seed=seed)
+    world.bullets.hit = lambda *args: False
+    while not world.boss_mode:
+        world.step(KEY_STATES[1])
+    return world
+
+
+def defeat_boss(world):
+    """Wait for the vulnerable phase, then land the last hit."""
+    bos = next(iter(world.boss))
+    bos.hp = 1
+    while not bos.is_vulnerable:
+        world.step(KEY_STATES[0])
+    world.player.rect.center = bos.rect.center
+    world.step(KEY_STATES[0])
+
+
+def test_boss_defeat_leaves_no_stray_timers(monkeypatch):
+    world = reach_boss(monkeypatch)
+    defeat_boss(world)
+    assert world.boss_defeated and not world.dead
+
+    for _ in range(120):    # long enough for every pre-boss coin's animation to fire again
+        world.step(KEY_STATES[0])
+    assert len(world.timers.pending()) == world.save_state(Snapshot()).n_timers